@@ -0,0 +1,5 @@
+import src.io_controller as io_controller
+import src.benchmark as benchmark
+
+io_controller.create_log()
+benchmark.run_benchmark()
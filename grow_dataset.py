@@ -0,0 +1,13 @@
+import src.io_controller as io_controller
+import src.data_operations as data_operations
+import src.typedb_iam.db_controller as db_controller
+import src.typedb_iam.db_operations as db_operations
+
+io_controller.create_log()
+
+with db_controller.client() as client:
+    delta_name = data_operations.grow_dataset()
+
+    if delta_name is not None:
+        db_operations.ensure_server_connection(client)
+        db_operations.load_delta(client, delta_name=delta_name)
@@ -7,3 +7,4 @@ io_controller.create_log()
 with db_controller.client() as client:
     db_operations.ensure_server_connection(client)
     db_operations.rebuild_database(client)
+    db_operations.run_test_queries(client)
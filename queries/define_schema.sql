@@ -68,7 +68,7 @@ CREATE TABLE set_membership (
 CREATE TABLE group_ownership (
     owned_group INT REFERENCES user_group(id),
     group_owner INT REFERENCES subject(id),
-    ownership_type VARCHAR(256)
+    ownership_type VARCHAR(256),
     PRIMARY KEY(owned_group, ownership_type)
 );
 
@@ -168,4 +168,77 @@ CREATE TABLE databases (
 CREATE TABLE tables (
     id INT PRIMARY KEY REFERENCES resource_collection(id),
     name VARCHAR(256)
-);
\ No newline at end of file
+);
+
+CREATE INDEX group_membership_member_index ON group_membership (group_member);
+
+CREATE INDEX collection_membership_member_index ON collection_membership (collection_member);
+
+CREATE INDEX set_membership_member_index ON set_membership (set_member);
+
+CREATE INDEX access_action_index ON access (valid_action);
+
+CREATE INDEX permission_access_index ON permission (permitted_access);
+
+CREATE VIEW transitive_group_membership AS
+WITH RECURSIVE closure(user_group, group_member) AS (
+    SELECT user_group, group_member FROM group_membership
+    UNION
+    SELECT closure.user_group, group_membership.group_member
+    FROM closure
+    JOIN group_membership ON group_membership.user_group = closure.group_member
+)
+SELECT user_group, group_member FROM closure;
+
+CREATE VIEW transitive_collection_membership AS
+WITH RECURSIVE closure(resource_collection, collection_member) AS (
+    SELECT resource_collection, collection_member FROM collection_membership
+    UNION
+    SELECT closure.resource_collection, collection_membership.collection_member
+    FROM closure
+    JOIN collection_membership ON collection_membership.resource_collection = closure.collection_member
+)
+SELECT resource_collection, collection_member FROM closure;
+
+CREATE VIEW transitive_set_membership AS
+WITH RECURSIVE closure(operation_set, set_member) AS (
+    SELECT operation_set, set_member FROM set_membership
+    UNION
+    SELECT closure.operation_set, set_membership.set_member
+    FROM closure
+    JOIN set_membership ON set_membership.operation_set = closure.set_member
+)
+SELECT operation_set, set_member FROM closure;
+
+CREATE VIEW effective_permission AS
+SELECT DISTINCT
+    subject_closure.group_member AS permitted_subject,
+    effective_access.id AS permitted_access,
+    effective_access.accessed_object,
+    effective_access.valid_action
+FROM permission
+JOIN access ON access.id = permission.permitted_access
+JOIN (
+    SELECT id AS user_group, id AS group_member FROM subject
+    UNION ALL
+    SELECT user_group, group_member FROM transitive_group_membership
+) AS subject_closure ON subject_closure.user_group = permission.permitted_subject
+JOIN (
+    SELECT id AS resource_collection, id AS collection_member FROM object
+    UNION ALL
+    SELECT resource_collection, collection_member FROM transitive_collection_membership
+) AS object_closure ON object_closure.resource_collection = access.accessed_object
+JOIN (
+    SELECT id AS operation_set, id AS set_member FROM actions
+    UNION ALL
+    SELECT operation_set, set_member FROM transitive_set_membership
+) AS action_closure ON action_closure.operation_set = access.valid_action
+JOIN access AS effective_access ON effective_access.accessed_object = object_closure.collection_member AND effective_access.valid_action = action_closure.set_member;
+
+CREATE MATERIALIZED VIEW effective_permission_cache AS
+SELECT permitted_subject, permitted_access, accessed_object, valid_action FROM effective_permission
+WITH NO DATA;
+
+CREATE INDEX effective_permission_cache_subject_index ON effective_permission_cache (permitted_subject);
+
+CREATE INDEX effective_permission_cache_object_index ON effective_permission_cache (accessed_object);
\ No newline at end of file
@@ -0,0 +1,7 @@
+SELECT DISTINCT COALESCE(business_unit.name, user_role.name, user_account.email) AS group_name
+FROM person
+JOIN transitive_group_membership ON transitive_group_membership.group_member = person.id
+LEFT JOIN business_unit ON business_unit.id = transitive_group_membership.user_group
+LEFT JOIN user_role ON user_role.id = transitive_group_membership.user_group
+LEFT JOIN user_account ON user_account.id = transitive_group_membership.user_group
+WHERE person.name = 'Kevin Morrison';
\ No newline at end of file
@@ -0,0 +1,6 @@
+SELECT DISTINCT COALESCE(file.filepath, directory.filepath) AS filepath
+FROM person
+JOIN object_ownership ON object_ownership.object_owner = person.id
+LEFT JOIN file ON file.id = object_ownership.owned_object
+LEFT JOIN directory ON directory.id = object_ownership.owned_object
+WHERE person.name = 'Kevin Morrison';
\ No newline at end of file
@@ -0,0 +1,8 @@
+SELECT DISTINCT COALESCE(file.filepath, directory.filepath) AS filepath, actions.name AS action_name
+FROM person
+JOIN effective_permission_cache ON effective_permission_cache.permitted_subject = person.id
+JOIN actions ON actions.id = effective_permission_cache.valid_action
+LEFT JOIN file ON file.id = effective_permission_cache.accessed_object
+LEFT JOIN directory ON directory.id = effective_permission_cache.accessed_object
+WHERE person.name = 'Kevin Morrison'
+LIMIT 10;
\ No newline at end of file
@@ -0,0 +1,5 @@
+SELECT DISTINCT directory.filepath
+FROM file
+JOIN transitive_collection_membership ON transitive_collection_membership.collection_member = file.id
+JOIN directory ON directory.id = transitive_collection_membership.resource_collection
+WHERE file.filepath = 'order_2021-09-23.xlsx';
\ No newline at end of file
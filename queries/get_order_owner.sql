@@ -0,0 +1,8 @@
+SELECT DISTINCT COALESCE(person.name, business_unit.name, user_role.name, user_account.email) AS subject_name
+FROM file
+JOIN object_ownership ON object_ownership.owned_object = file.id
+LEFT JOIN person ON person.id = object_ownership.object_owner
+LEFT JOIN business_unit ON business_unit.id = object_ownership.object_owner
+LEFT JOIN user_role ON user_role.id = object_ownership.object_owner
+LEFT JOIN user_account ON user_account.id = object_ownership.object_owner
+WHERE file.filepath = 'order_2021-09-23.xlsx';
\ No newline at end of file
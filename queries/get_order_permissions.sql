@@ -0,0 +1,10 @@
+SELECT DISTINCT COALESCE(person.name, business_unit.name, user_role.name, user_account.email) AS subject_name, actions.name AS action_name
+FROM file
+JOIN effective_permission_cache ON effective_permission_cache.accessed_object = file.id
+JOIN actions ON actions.id = effective_permission_cache.valid_action
+LEFT JOIN person ON person.id = effective_permission_cache.permitted_subject
+LEFT JOIN business_unit ON business_unit.id = effective_permission_cache.permitted_subject
+LEFT JOIN user_role ON user_role.id = effective_permission_cache.permitted_subject
+LEFT JOIN user_account ON user_account.id = effective_permission_cache.permitted_subject
+WHERE file.filepath = 'order_2021-09-23.xlsx'
+LIMIT 10;
\ No newline at end of file
@@ -0,0 +1,223 @@
+import datetime
+import importlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+import src.utilities as utilities
+import src.io_controller as io_controller
+import src.data_generation as data_generation
+
+
+def get_int_param(params, name, default, minimum=0):
+    try:
+        value = int(params[name])
+
+        if value < minimum:
+            raise ValueError
+
+        io_controller.out_debug('Benchmark', name, 'set to:', value)
+        return value
+    except (KeyError, ValueError):
+        io_controller.out_debug('Benchmark', name, 'set to', default, 'by default as no correct option was set.')
+        io_controller.out_debug('Check configuration at:', os.getcwd() + '/config.ini')
+        return default
+
+
+def get_list_param(params, name, default):
+    try:
+        values = list(value.strip() for value in params[name].split(',') if value.strip() != '')
+
+        if len(values) == 0:
+            raise KeyError
+
+        return values
+    except KeyError:
+        return default
+
+
+def get_benchmark_params():
+    # Dataset sizes are swept over the paired entries of user_counts and resource_counts.
+    # If either list is not set, the counts in the data generation section are used for a single run.
+
+    params = utilities.get_config_params('config.ini', 'benchmark')
+    generation_params = utilities.get_config_params('config.ini', 'data_generation')
+
+    try:
+        user_counts = list(int(count) for count in get_list_param(params, 'user_counts', [generation_params['user_count']]))
+        resource_counts = list(int(count) for count in get_list_param(params, 'resource_counts', [generation_params['resource_count']]))
+    except ValueError:
+        io_controller.out_fatal('Benchmark user and resource counts must be comma separated integers.')
+        io_controller.out_fatal('Check configuration at:', os.getcwd() + '/config.ini')
+        io_controller.kill()
+
+    if len(user_counts) == 1:
+        user_counts = user_counts * len(resource_counts)
+    elif len(resource_counts) == 1:
+        resource_counts = resource_counts * len(user_counts)
+
+    if len(user_counts) != len(resource_counts):
+        io_controller.out_fatal('Benchmark user and resource counts must be lists of equal length.')
+        io_controller.out_fatal('Check configuration at:', os.getcwd() + '/config.ini')
+        io_controller.kill()
+
+    return {
+        'backends': get_list_param(params, 'backends', ['typedb', 'postgres']),
+        'warmup': get_int_param(params, 'warmup', 5),
+        'repetitions': get_int_param(params, 'repetitions', 50, minimum=1),
+        'concurrency': get_int_param(params, 'concurrency', 1, minimum=1),
+        'sweep': list(zip(user_counts, resource_counts)),
+        'results_path': params.get('results_path', 'results') or 'results'
+    }
+
+
+def get_percentile(sorted_values, percent):
+    # Linearly interpolates between the closest ranks of a sorted list of values.
+
+    if len(sorted_values) == 0:
+        return None
+
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarise(timings, elapsed):
+    latencies = sorted(latency for latency, row_count in timings)
+    row_counts = sorted(set(row_count for latency, row_count in timings))
+
+    return {
+        'repetitions': len(timings),
+        'rows': row_counts[0] if len(row_counts) == 1 else row_counts,
+        'latency': {
+            'mean': sum(latencies) / len(latencies),
+            'min': latencies[0],
+            'p50': get_percentile(latencies, 50),
+            'p95': get_percentile(latencies, 95),
+            'p99': get_percentile(latencies, 99),
+            'max': latencies[-1]
+        },
+        'elapsed': elapsed,
+        'throughput': len(timings) / elapsed if elapsed > 0 else None
+    }
+
+
+def time_query(run_query, session, query):
+    start_time = time.perf_counter()
+    row_count = run_query(session, query)
+    return time.perf_counter() - start_time, row_count
+
+
+def run_repetitions(run_query, session, query, repetitions):
+    return list(time_query(run_query, session, query) for _ in range(repetitions))
+
+
+def benchmark_query(run_query, sessions, query, warmup, repetitions):
+    # Each session is warmed up in turn, then the repetitions are split as evenly as possible between the sessions.
+    # Every session runs its share of repetitions sequentially on its own thread, so the concurrency is the number of sessions.
+    # Throughput is measured over the wall time of all threads, and latencies are measured per query.
+
+    for session in sessions:
+        for _ in range(warmup):
+            run_query(session, query)
+
+    shares = list(repetitions // len(sessions) + (1 if i < repetitions % len(sessions) else 0) for i in range(len(sessions)))
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        futures = list(executor.submit(run_repetitions, run_query, session, query, share) for session, share in zip(sessions, shares) if share > 0)
+        timings = list(timing for future in futures for timing in future.result())
+
+    elapsed = time.perf_counter() - start_time
+    return summarise(timings, elapsed)
+
+
+def benchmark_queries(run_query, sessions, named_queries, params):
+    # Runs each named query with the given function, which takes a session and a query and returns a row count.
+
+    results = dict()
+
+    for query_name in named_queries:
+        io_controller.out_info('Benchmarking query:', query_name)
+        results[query_name] = benchmark_query(run_query, sessions, named_queries[query_name], params['warmup'], params['repetitions'])
+        latency = results[query_name]['latency']
+        io_controller.out_info('Median latency:', utilities.intsigfig(latency['p50'] * 1000, 3), 'ms, p95:', utilities.intsigfig(latency['p95'] * 1000, 3), 'ms, p99:', utilities.intsigfig(latency['p99'] * 1000, 3), 'ms')
+
+    return results
+
+
+def save_results(results, file_path):
+    directory = os.path.dirname(file_path)
+
+    if directory != '' and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(file_path + '.tmp', 'w') as file:
+        json.dump(results, file, indent=2)
+
+    os.replace(file_path + '.tmp', file_path)
+
+
+def prepare_dataset(user_count, resource_count):
+    # Datasets are saved under a name for their size, and reused by later benchmarks with the same size if they were
+    # generated with the same generation key. Otherwise, including when no seed is set, the dataset is generated again.
+
+    dataset_name = 'benchmark_' + str(user_count) + '_users_' + str(resource_count) + '_resources'
+    generation_key = data_generation.get_generation_key(user_count=user_count, resource_count=resource_count)
+
+    if generation_key is not None and data_generation.get_cached_generation_key(dataset_name) == generation_key:
+        io_controller.out_info('Reusing saved dataset:', dataset_name)
+        return dataset_name
+
+    if os.path.exists('data/' + dataset_name):
+        io_controller.out_info('Replacing outdated dataset:', dataset_name)
+        shutil.rmtree('data/' + dataset_name)
+
+    data = data_generation.generate_data(user_count=user_count, resource_count=resource_count)
+    data_generation.save_data(data, dataset_name=dataset_name, generation_key=generation_key)
+    return dataset_name
+
+
+def benchmark_backend(backend, dataset_name, params):
+    # Backend packages are imported on demand, so that only the drivers of the benchmarked backends need to be installed.
+    # Each backend package provides the same database operations, including benchmark_test_queries.
+
+    db_controller = importlib.import_module('src.' + backend + '_iam.db_controller')
+    db_operations = importlib.import_module('src.' + backend + '_iam.db_operations')
+
+    with db_controller.client() as client:
+        db_operations.ensure_server_connection(client)
+        db_operations.rebuild_database(client, dataset_name=dataset_name, force=True)
+        return db_operations.benchmark_test_queries(client, params)
+
+
+def run_benchmark():
+    params = get_benchmark_params()
+    file_name = 'benchmark_' + datetime.datetime.now().strftime('%Y%m%d_%H%M%S') + '.json'
+    file_path = os.path.join(params['results_path'], file_name)
+
+    results = {
+        'timestamp': datetime.datetime.now().isoformat(),
+        'params': {key: params[key] for key in params if key != 'results_path'},
+        'runs': list()
+    }
+
+    for user_count, resource_count in params['sweep']:
+        dataset_name = prepare_dataset(user_count, resource_count)
+
+        for backend in params['backends']:
+            io_controller.out_info('Benchmarking', backend, 'with', user_count, 'users and', resource_count, 'resources.')
+
+            results['runs'].append({
+                'backend': backend,
+                'user_count': user_count,
+                'resource_count': resource_count,
+                'queries': benchmark_backend(backend, dataset_name, params)
+            })
+
+            save_results(results, file_path)
+
+    io_controller.out_info('Benchmark results saved to:', file_path)
+    return results
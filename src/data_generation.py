@@ -1,18 +1,39 @@
 import json
+import bisect
 import datetime
 import calendar
 import string
 import uuid
 import copy
 import os
+import shutil
+import hashlib
 from random import Random
+from concurrent.futures import ProcessPoolExecutor
 import src.utilities as utilities
+import src.generator_tables as generator_tables
 import src.io_controller as io_controller
 from src.io_controller import ProgressBar
 
 
-def generate_uuid():
-    return str(uuid.uuid4())
+def generate_uuid(rng=None):
+    # Ids are drawn from the given generator when there is one, so that seeded datasets have reproducible ids.
+    # Otherwise they are drawn from OS entropy.
+
+    if rng is None:
+        return str(uuid.uuid4())
+
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def get_id_rng(seed):
+    # Ids are drawn from a generator of their own, derived from a seed, so drawing them leaves other seeded output as it was.
+    # Returns None if there is no seed, in which case ids are drawn from OS entropy.
+
+    if seed is None:
+        return None
+
+    return Random(str(seed) + '/ids')
 
 
 def generate_letter(rng=Random()):
@@ -23,8 +44,7 @@ def generate_letters(length, prevent_banned_strings=True, rng=Random()):
     letters = ''.join(generate_letter(rng=rng) for _ in range(length))
 
     if prevent_banned_strings:
-        with open('generator_tables/banned_strings.tsv', 'r') as file:
-            banned_strings = file.read().split('\n')
+        banned_strings = generator_tables.get_banned_strings()
 
         if any(banned_string in letters for banned_string in banned_strings):
             return generate_letters(length, rng=rng)
@@ -52,17 +72,11 @@ def generate_date(past_years=10, year=None, month=None, day=None, rng=Random()):
 
 
 def load_name(name_type, rng=Random()):
-    # Name lists taken from: https://github.com/treyhunner/names/
-    # Licensed under the MIT License.
+    # Selects the first name with a cumulative weight above a random threshold, by binary search.
 
+    names, cumulatives = generator_tables.get_name_table(name_type)
     r = rng.uniform(0.0, 90.0)
-
-    with open('generator_tables/' + name_type + '_names.tsv') as file:
-        for line in file:
-            name, weight, cumulative, rank = line.split('\t')
-
-            if float(cumulative) > r:
-                return name
+    return names[bisect.bisect_right(cumulatives, r)]
 
 
 def generate_name(name_type='full', case='title', rng=Random()):
@@ -95,7 +109,7 @@ def generate_resolution(rng=Random()):
     return str(rng.randint(1, 4) * 360) + 'x' + str(rng.randint(1, 4) * 360)
 
 
-def construct_string(constructor, rng=Random()):
+def construct_string(constructor, rng=Random(), id_rng=None):
     # Generates a string from a constructor string.
     # A constructor string is formed of any number of parts separated by the '&' character.
     # A constructor part consists either of a raw string, or a generator command.
@@ -115,6 +129,7 @@ def construct_string(constructor, rng=Random()):
 
             if command == 'uuid':
                 generator = generate_uuid
+                kwargs['rng'] = id_rng
             elif command == 'letter':
                 generator = generate_letter
                 kwargs['rng'] = rng
@@ -142,33 +157,25 @@ def construct_string(constructor, rng=Random()):
 
 
 def load_user_groups(group_type='user_group', get_abstract_groups=True):
-    with open('generator_tables/user_groups.json', 'r') as file:
-        user_groups = json.load(file)
-
-    user_groups = list(group for group in user_groups if group_type in group['type'])
-
-    if not get_abstract_groups:
-        user_groups = list(group for group in user_groups if not group['is_abstract'])
-
-    return user_groups
+    return generator_tables.thaw(generator_tables.get_user_group_table(group_type, get_abstract_groups))
 
 
 def generate_business_units(rng=Random()):
-    units = load_user_groups('business_unit', get_abstract_groups=False)
+    units = generator_tables.get_user_group_table('business_unit', get_abstract_groups=False)
     return list(unit['name'] for unit in [rng.choice(units)])
 
 
 def generate_user_roles(rng=Random()):
-    roles = load_user_groups('user_role', get_abstract_groups=False)
+    roles = generator_tables.get_user_group_table('user_role', get_abstract_groups=False)
     return list(role['name'] for role in roles if rng.random() < 0.15)
 
 
 def generate_user_accounts(rng=Random()):
-    accounts = load_user_groups('user_account', get_abstract_groups=False)
+    accounts = generator_tables.get_user_group_table('user_account', get_abstract_groups=False)
     return list(account['name'] for account in accounts if rng.random() < 0.15)
 
 
-def generate_user(name=None, rng=Random()):
+def generate_user(name=None, rng=Random(), id_rng=None):
     if name is None:
         name = generate_name(rng=rng)
 
@@ -179,37 +186,41 @@ def generate_user(name=None, rng=Random()):
         'business_unit': generate_business_units(rng=rng),
         'user_role': generate_user_roles(rng=rng),
         'user_account': generate_user_accounts(rng=rng),
-        'uuid': generate_uuid()
+        'uuid': generate_uuid(rng=id_rng)
     }
 
     return user
 
 
-def generate_users(count, rng=Random()):
+def generate_users(count, rng=Random(), excluded_names=(), display_progress=True, id_rng=None):
     names = set()
     io_controller.out_info('Generating', count, 'names:')
 
-    with ProgressBar(count) as progress_bar:
+    with ProgressBar(count, display=display_progress) as progress_bar:
         while len(names) < count:
-            names.add(generate_name(rng=rng))
+            name = generate_name(rng=rng)
+
+            if name not in excluded_names:
+                names.add(name)
+
             progress_bar.set_step(len(names))
 
     users = list()
     io_controller.out_info('Generating', count, 'users:')
 
-    with ProgressBar(count) as progress_bar:
+    with ProgressBar(count, display=display_progress) as progress_bar:
         for name in sorted(list(names)):
-            users.append(generate_user(name, rng=rng))
+            users.append(generate_user(name, rng=rng, id_rng=id_rng))
             progress_bar.increment()
 
     return users
 
 
-def get_user_groups():
+def get_user_groups(id_rng=None):
     user_groups = load_user_groups()
 
     for group in user_groups:
-        group['uuid'] = generate_uuid()
+        group['uuid'] = generate_uuid(rng=id_rng)
 
     for parent_group in user_groups:
         member_ids = list()
@@ -223,71 +234,79 @@ def get_user_groups():
     return user_groups
 
 
-def generate_subjects(user_count, rng=Random()):
-    users = generate_users(user_count, rng=rng)
-    user_groups = get_user_groups()
+def index_by_name(items):
+    # Maps each name to the items with that name, in list order, so memberships can be assigned by hash join.
+
+    items_by_name = dict()
+
+    for item in items:
+        items_by_name.setdefault(item['name'], list()).append(item)
+
+    return items_by_name
+
+
+def assign_users(users, user_groups):
     io_controller.out_info('Assigning', len(users), 'users to', len(user_groups), 'groups:')
 
-    with ProgressBar(len(user_groups) * len(users)) as progress_bar:
-        for group in user_groups:
-            for user in users:
-                if group['name'] in user['business_unit'] + user['user_role'] + user['user_account']:
+    groups_by_name = index_by_name(user_groups)
+
+    with ProgressBar(len(users)) as progress_bar:
+        for user in users:
+            for group_name in dict.fromkeys(user['business_unit'] + user['user_role'] + user['user_account']):
+                for group in groups_by_name.get(group_name, ()):
                     group['member'].append(user['uuid'])
 
-                progress_bar.increment()
+            progress_bar.increment()
 
+
+def generate_subjects(user_count, rng=Random(), id_rng=None):
+    users = generate_users(user_count, rng=rng, id_rng=id_rng)
+    user_groups = get_user_groups(id_rng=id_rng)
+    assign_users(users, user_groups)
     return users + user_groups
 
 
 def load_resource_collections(collection_type='resource_collection', get_abstract_collections=True):
-    with open('generator_tables/resource_collections.json', 'r') as file:
-        resource_collections = json.load(file)
-
-    resource_collections = list(collection for collection in resource_collections if collection_type in collection['type'])
-
-    if not get_abstract_collections:
-        resource_collections = list(collection for collection in resource_collections if not collection['is_abstract'])
-
-    return resource_collections
+    return generator_tables.thaw(generator_tables.get_resource_collection_table(collection_type, get_abstract_collections))
 
 
 def generate_directory(rng=Random()):
-    collections = load_resource_collections('directory', get_abstract_collections=False)
+    collections = generator_tables.get_resource_collection_table('directory', get_abstract_collections=False)
     return rng.choice(collections)
 
 
-def generate_resource(rng=Random()):
+def generate_resource(rng=Random(), id_rng=None):
     directory = generate_directory(rng=rng)
 
     resource = {
-        'name': construct_string(directory['resource_format'], rng=rng),
+        'name': construct_string(directory['resource_format'], rng=rng, id_rng=id_rng),
         'type': ['object', 'resource', 'file'],
         'parent': [directory['name']],
         'parent_type': 'directory',
-        'uuid': generate_uuid()
+        'uuid': generate_uuid(rng=id_rng)
     }
 
     return resource
 
 
-def generate_resources(count, rng=Random()):
+def generate_resources(count, rng=Random(), display_progress=True, id_rng=None):
     resources = list()
     io_controller.out_info('Generating', count, 'resources:')
 
-    with ProgressBar(count) as progress_bar:
+    with ProgressBar(count, display=display_progress) as progress_bar:
         while len(resources) < count:
-            resource = generate_resource(rng=rng)
+            resource = generate_resource(rng=rng, id_rng=id_rng)
             resources.append(resource)
             progress_bar.increment()
 
     return resources
 
 
-def get_resource_collections():
+def get_resource_collections(id_rng=None):
     resource_collections = load_resource_collections()
 
     for collection in resource_collections:
-        collection['uuid'] = generate_uuid()
+        collection['uuid'] = generate_uuid(rng=id_rng)
 
     for parent_collection in resource_collections:
         member_ids = list()
@@ -301,51 +320,45 @@ def get_resource_collections():
     return resource_collections
 
 
-def generate_objects(resource_count, rng=Random()):
-    resources = generate_resources(resource_count, rng=rng)
-    resource_collections = get_resource_collections()
+def assign_resources(resources, resource_collections):
     io_controller.out_info('Assigning', len(resources), 'resources to', len(resource_collections), 'collections:')
 
-    with ProgressBar(len(resources) * len(resource_collections)) as progress_bar:
-        for collection in resource_collections:
-            for resource in resources:
-                if resource['parent_type'] in collection['type'] and collection['name'] in resource['parent']:
-                    collection['member'].append(resource['uuid'])
+    collections_by_name = index_by_name(resource_collections)
 
-                progress_bar.increment()
+    with ProgressBar(len(resources)) as progress_bar:
+        for resource in resources:
+            for collection_name in dict.fromkeys(resource['parent']):
+                for collection in collections_by_name.get(collection_name, ()):
+                    if resource['parent_type'] in collection['type']:
+                        collection['member'].append(resource['uuid'])
 
-    return resources + resource_collections
+            progress_bar.increment()
 
 
-def load_operations(object_type=None):
-    with open('generator_tables/operations.json', 'r') as file:
-        operations = json.load(file)
+def generate_objects(resource_count, rng=Random(), id_rng=None):
+    resources = generate_resources(resource_count, rng=rng, id_rng=id_rng)
+    resource_collections = get_resource_collections(id_rng=id_rng)
+    assign_resources(resources, resource_collections)
+    return resources + resource_collections
 
-    if object_type is not None:
-        operations = list(operation for operation in operations if object_type in operation['object_type'])
 
-    return operations
+def load_operations(object_type=None):
+    return generator_tables.thaw(generator_tables.get_operation_table(object_type))
 
 
 def load_operation_sets(object_type=None):
-    with open('generator_tables/operation_sets.json', 'r') as file:
-        operation_sets = json.load(file)
+    return generator_tables.thaw(generator_tables.get_operation_set_table(object_type))
 
-    if object_type is not None:
-        operation_sets = list(opset for opset in operation_sets if object_type in opset['object_type'])
 
-    return operation_sets
-
-
-def get_actions():
+def get_actions(id_rng=None):
     operations = load_operations()
     operation_sets = load_operation_sets()
 
     for operation in operations:
-        operation['uuid'] = generate_uuid()
+        operation['uuid'] = generate_uuid(rng=id_rng)
 
     for opset in operation_sets:
-        opset['uuid'] = generate_uuid()
+        opset['uuid'] = generate_uuid(rng=id_rng)
 
     for parent_set in operation_sets:
         member_ids = list()
@@ -364,16 +377,7 @@ def get_actions():
 
 
 def load_permissions(subject_type=None, object_type=None):
-    with open('generator_tables/permissions.json', 'r') as file:
-        permissions = json.load(file)
-
-    if subject_type is not None:
-        permissions = list(permission for permission in permissions if subject_type == permission['subject_type'])
-
-    if object_type is not None:
-        permissions = list(permission for permission in permissions if object_type == permission['object_type'])
-
-    return permissions
+    return generator_tables.thaw(generator_tables.get_permission_table(subject_type, object_type))
 
 
 def get_permissions(subjects, objects, actions):
@@ -403,114 +407,198 @@ def get_permissions(subjects, objects, actions):
     return permissions
 
 
-def get_member_uuids(uuid, item_list):
-    for item in item_list:
-        try:
-            if item['uuid'] == uuid:
-                return item['member']
-        except KeyError:
-            continue
+class MembershipGraph:
+    # An index of the memberships between items in an item list, built once and then queried in place of the list.
+    # Holds each item by uuid, with forward (parent to members) and reverse (member to parents) adjacency lists.
+    # Nested queries are computed without recursion and memoised, so the graph should not be used once memberships in
+    # the underlying item list have been modified.
+
+    def __init__(self, item_list):
+        self.items = dict()
+        self.positions = dict()
+        self.members = dict()
+        self.memberships = dict()
+        self.nested_members = dict()
+        self.nested_memberships = dict()
+
+        for position, item in enumerate(item_list):
+            try:
+                uuid = item['uuid']
+            except KeyError:
+                continue
 
-    return list()
+            if uuid not in self.items:
+                self.items[uuid] = item
+                self.positions[uuid] = position
 
+            try:
+                member_uuids = item['member']
+            except KeyError:
+                continue
 
-def get_nested_member_uuids(uuid, item_list):
-    uuids = list()
+            if uuid not in self.members:
+                self.members[uuid] = list(member_uuids)
 
-    for member_uuid in get_member_uuids(uuid, item_list):
-        uuids.append(member_uuid)
-        uuids += get_nested_member_uuids(member_uuid, item_list)
+            for member_uuid in dict.fromkeys(member_uuids):
+                self.memberships.setdefault(member_uuid, list()).append(uuid)
 
-    return uuids
+    @staticmethod
+    def get_closure(uuid, adjacency, closures):
+        # Computes the nested closure of a uuid, defined as the concatenation of [neighbour] + closure(neighbour) over
+        # each of its neighbours in turn, by an iterative depth-first traversal.
+        # Each stack entry keeps its place in its neighbour list, so that no neighbour list is scanned more than once.
+        # Closures are memoised as they are completed. An edge leading back to a uuid still being traversed would form
+        # a cycle, so the neighbour is included but its closure is not.
 
+        if uuid in closures:
+            return list(closures[uuid])
 
-def get_membership_uuids(uuid, item_list):
-    uuids = list()
+        stack = [(uuid, iter(adjacency.get(uuid, ())))]
+        traversing = {uuid}
 
-    for item in item_list:
-        try:
-            if uuid in item['member']:
-                uuids.append(item['uuid'])
-        except KeyError:
-            continue
+        while len(stack) != 0:
+            current_uuid, neighbours = stack[-1]
 
-    return uuids
+            for neighbour_uuid in neighbours:
+                if neighbour_uuid not in closures and neighbour_uuid not in traversing:
+                    stack.append((neighbour_uuid, iter(adjacency.get(neighbour_uuid, ()))))
+                    traversing.add(neighbour_uuid)
+                    break
+            else:
+                closure = list()
 
+                for neighbour_uuid in adjacency.get(current_uuid, ()):
+                    closure.append(neighbour_uuid)
+                    closure += closures.get(neighbour_uuid, ())
 
-def get_nested_membership_uuids(uuid, item_list):
-    uuids = list()
+                closures[current_uuid] = tuple(closure)
+                stack.pop()
+                traversing.remove(current_uuid)
 
-    for membership_uuid in get_membership_uuids(uuid, item_list):
-        uuids.append(membership_uuid)
-        uuids += get_nested_membership_uuids(membership_uuid, item_list)
+        return list(closures[uuid])
 
-    return uuids
+    def get_member_uuids(self, uuid):
+        return list(self.members.get(uuid, ()))
 
+    def get_nested_member_uuids(self, uuid):
+        return self.get_closure(uuid, self.members, self.nested_members)
 
-def get_items(uuids, item_list):
-    items = list()
+    def get_membership_uuids(self, uuid):
+        return list(self.memberships.get(uuid, ()))
 
-    for item in item_list:
-        try:
-            if item['uuid'] in uuids:
-                items.append(item)
-        except KeyError:
-            continue
+    def get_nested_membership_uuids(self, uuid):
+        return self.get_closure(uuid, self.memberships, self.nested_memberships)
+
+    def get_items(self, uuids):
+        # Returns the items with the given uuids, without duplicates and in their order in the item list.
+
+        uuids = sorted((uuid for uuid in set(uuids) if uuid in self.items), key=self.positions.get)
+        return list(self.items[uuid] for uuid in uuids)
 
-    return items
+    def get_nested_members(self, item):
+        return self.get_items(self.get_nested_member_uuids(item['uuid']))
+
+    def get_nested_memberships(self, item):
+        return self.get_items(self.get_nested_membership_uuids(item['uuid']))
+
+
+def get_member_uuids(uuid, item_list):
+    return MembershipGraph(item_list).get_member_uuids(uuid)
+
+
+def get_nested_member_uuids(uuid, item_list):
+    return MembershipGraph(item_list).get_nested_member_uuids(uuid)
+
+
+def get_membership_uuids(uuid, item_list):
+    return MembershipGraph(item_list).get_membership_uuids(uuid)
+
+
+def get_nested_membership_uuids(uuid, item_list):
+    return MembershipGraph(item_list).get_nested_membership_uuids(uuid)
+
+
+def get_items(uuids, item_list):
+    return MembershipGraph(item_list).get_items(uuids)
 
 
 def get_nested_members(item, item_list):
-    member_uuids = get_nested_member_uuids(item['uuid'], item_list)
-    return get_items(member_uuids, item_list)
+    return MembershipGraph(item_list).get_nested_members(item)
 
 
 def get_nested_memberships(item, item_list):
-    membership_uuids = get_nested_membership_uuids(item['uuid'], item_list)
-    return get_items(membership_uuids, item_list)
+    return MembershipGraph(item_list).get_nested_memberships(item)
 
 
-def assign_group_owner(user_group, item_list, rng=Random()):
-    users = list(item for item in item_list if 'user' in item['type'])
-    members = get_nested_members(user_group, item_list)
+def assign_group_owner(user_group, item_list, rng=Random(), graph=None):
+    if graph is None:
+        graph = MembershipGraph(item_list)
+
+    members = graph.get_nested_members(user_group)
     candidate_owner_uuids = list()
 
     for member in members:
-        if member in users:
+        if 'user' in member['type']:
             candidate_owner_uuids.append(member['uuid'])
 
     if len(candidate_owner_uuids) > 0:  # This is a quickfix for a crash with 0 members in the group documentation
                                              # if `user_count` is too low
         user_group['owner'] = [rng.choice(candidate_owner_uuids)]
     else:
+        users = list(item for item in item_list if 'user' in item['type'])
         user_group['owner'] = [rng.choice(users)['uuid']]
 
 
 def assign_group_owners(item_list, rng=Random()):
     user_groups = list(item for item in item_list if 'user_group' in item['type'])
+    graph = MembershipGraph(item_list)
     io_controller.out_info('Assigning owners for', len(user_groups), 'groups:')
 
     with ProgressBar(len(user_groups)) as progress_bar:
         for user_group in user_groups:
-            assign_group_owner(user_group, item_list, rng=rng)
+            assign_group_owner(user_group, item_list, rng=rng, graph=graph)
             progress_bar.increment()
 
 
-def assign_object_owner(obj, item_list, rng=Random()):
-    users = list(item for item in item_list if 'user' in item['type'])
-    permissions = list(item for item in item_list if 'permission' in item['type'])
-    membership_uuids = get_nested_membership_uuids(obj['uuid'], item_list) + [obj['uuid']]
+def index_object_permissions(permissions):
+    # Maps each object uuid to the positions in the permission list of the permissions on that object, in list order.
+
+    object_permissions = dict()
+
+    for position, permission in enumerate(permissions):
+        for uuid in dict.fromkeys(permission['object']):
+            object_permissions.setdefault(uuid, list()).append(position)
+
+    return object_permissions
+
+
+def assign_object_owner(obj, item_list, rng=Random(), graph=None, users=None, permissions=None, object_permissions=None):
+    if graph is None:
+        graph = MembershipGraph(item_list)
+
+    if users is None:
+        users = list(item for item in item_list if 'user' in item['type'])
+
+    if permissions is None:
+        permissions = list(item for item in item_list if 'permission' in item['type'])
+        object_permissions = index_object_permissions(permissions)
+
+    membership_uuids = graph.get_nested_membership_uuids(obj['uuid']) + [obj['uuid']]
+    permission_positions = set()
+
+    for uuid in membership_uuids:
+        permission_positions.update(object_permissions.get(uuid, ()))
+
     subject_uuids = list()
 
-    for permission in permissions:
-        if any(uuid in permission['object'] for uuid in membership_uuids):
-            subject_uuids += permission['subject']
+    for position in sorted(permission_positions):
+        subject_uuids += permissions[position]['subject']
 
     candidate_owner_uuids = list()
     candidate_owner_uuids += subject_uuids
 
     for uuid in subject_uuids:
-        candidate_owner_uuids += get_nested_member_uuids(uuid, item_list)
+        candidate_owner_uuids += graph.get_nested_member_uuids(uuid)
 
     if len(candidate_owner_uuids) > 0:  # Fix to match group owner assignment.
         obj['owner'] = [rng.choice(candidate_owner_uuids)]
@@ -518,18 +606,26 @@ def assign_object_owner(obj, item_list, rng=Random()):
         obj['owner'] = [rng.choice(users)['uuid']]
 
 
-def assign_object_owners(item_list, rng=Random()):
-    objects = list(item for item in item_list if 'object' in item['type'])
+def assign_object_owners(item_list, rng=Random(), objects=None):
+    if objects is None:
+        objects = list(item for item in item_list if 'object' in item['type'])
+
+    users = list(item for item in item_list if 'user' in item['type'])
+    permissions = list(item for item in item_list if 'permission' in item['type'])
+    object_permissions = index_object_permissions(permissions)
+    graph = MembershipGraph(item_list)
     io_controller.out_info('Assigning owners for', len(objects), 'objects:')
 
     with ProgressBar(len(objects)) as progress_bar:
         for obj in objects:
-            assign_object_owner(obj, item_list, rng=rng)
+            assign_object_owner(obj, item_list, rng=rng, graph=graph, users=users, permissions=permissions, object_permissions=object_permissions)
             progress_bar.increment()
 
 
-def assign_owner_permissions(item_list):
-    objects = list(item for item in item_list if 'object' in item['type'])
+def assign_owner_permissions(item_list, objects=None):
+    if objects is None:
+        objects = list(item for item in item_list if 'object' in item['type'])
+
     actions = list(item for item in item_list if 'action' in item['type'])
 
     owner_permissions_template = [
@@ -567,10 +663,129 @@ def assign_owner_permissions(item_list):
             progress_bar.increment()
 
 
-def generate_data():
+def get_generation_workers(params):
+    # Returns the number of worker processes for sharded generation, or None if sharded generation is not enabled.
+
+    try:
+        if params['parallel'].lower() != 'true':
+            raise KeyError
+    except KeyError:
+        io_controller.out_debug('Sharded generation disabled.')
+        return None
+
+    try:
+        workers = int(params['workers'])
+
+        if workers < 1:
+            raise ValueError
+    except (KeyError, ValueError):
+        workers = os.cpu_count() or 1
+
+    io_controller.out_debug('Sharded generation enabled with', workers, 'workers.')
+    return workers
+
+
+def get_generation_shard_size(params):
+    try:
+        shard_size = int(params['parallel_shard_size'])
+
+        if shard_size < 1:
+            raise ValueError
+
+        return shard_size
+    except (KeyError, ValueError):
+        return 10000
+
+
+def get_generation_shards(count, shard_size, rng_seed, stream_name):
+    # Splits a count into shards of a fixed size, each with a seed derived from the configured seed and its position.
+    # Shards depend only on the count, shard size and seed, so the output does not depend on how many workers are used.
+
+    shards = list()
+
+    for shard_index, start in enumerate(range(0, count, shard_size)):
+        if rng_seed is None:
+            shard_seed = None
+        else:
+            shard_seed = str(rng_seed) + '/' + stream_name + '/' + str(shard_index)
+
+        shards.append((min(shard_size, count - start), shard_seed))
+
+    return shards
+
+
+def generate_user_shard(shard):
+    count, shard_seed = shard
+    return generate_users(count, rng=Random(shard_seed), display_progress=False, id_rng=get_id_rng(shard_seed))
+
+
+def generate_resource_shard(shard):
+    count, shard_seed = shard
+    return generate_resources(count, rng=Random(shard_seed), display_progress=False, id_rng=get_id_rng(shard_seed))
+
+
+def deduplicate_users(users, count, rng=Random(), id_rng=None):
+    # Names are only unique within a shard, so later users with a name already taken are dropped when the shards are
+    # merged, and replaced by new users with untaken names.
+
+    unique_users = list()
+    names = set()
+
+    for user in users:
+        if user['name'] not in names:
+            names.add(user['name'])
+            unique_users.append(user)
+
+    if len(unique_users) < count:
+        io_controller.out_debug('Replacing', count - len(unique_users), 'users with duplicate names.')
+        unique_users += generate_users(count - len(unique_users), rng=rng, excluded_names=names, display_progress=False, id_rng=id_rng)
+
+    return unique_users
+
+
+def generate_sharded_items(user_count, resource_count, rng_seed, workers, shard_size):
+    # Generates users and resources in shards over a pool of worker processes, and merges the shards in order.
+    # Shards are generated silently, and progress is only reported by this process. The log is flushed before the
+    # workers are started, so that they do not inherit any buffered entries.
+
+    user_shards = get_generation_shards(user_count, shard_size, rng_seed, 'users')
+    resource_shards = get_generation_shards(resource_count, shard_size, rng_seed, 'resources')
+    io_controller.out_info('Generating', user_count, 'users and', resource_count, 'resources in', len(user_shards) + len(resource_shards), 'shards:')
+    users = list()
+    resources = list()
+
+    io_controller.flush_log()
+
+    with ProgressBar(len(user_shards) + len(resource_shards)) as progress_bar:
+        with ProcessPoolExecutor(max_workers=workers, initializer=io_controller.silence_output) as executor:
+            user_futures = list(executor.submit(generate_user_shard, shard) for shard in user_shards)
+            resource_futures = list(executor.submit(generate_resource_shard, shard) for shard in resource_shards)
+
+            for future in user_futures:
+                users += future.result()
+                progress_bar.increment()
+
+            for future in resource_futures:
+                resources += future.result()
+                progress_bar.increment()
+
+    if rng_seed is None:
+        replacement_seed = None
+    else:
+        replacement_seed = str(rng_seed) + '/users/replacements'
+
+    users = deduplicate_users(users, user_count, rng=Random(replacement_seed), id_rng=get_id_rng(replacement_seed))
+    return users, resources
+
+
+def generate_data(user_count=None, resource_count=None):
     params = utilities.get_config_params('config.ini', 'data_generation')
-    user_count = int(params['user_count'])
-    resource_count = int(params['resource_count'])
+
+    if user_count is None:
+        user_count = int(params['user_count'])
+
+    if resource_count is None:
+        resource_count = int(params['resource_count'])
 
     io_controller.out_info('Generating data...')
 
@@ -579,12 +794,27 @@ def generate_data():
         rng = Random(rng_seed)
         io_controller.out_debug('Using seed:', rng_seed)
     except (KeyError, ValueError):
+        rng_seed = None
         rng = Random()
         io_controller.out_debug('Using random seed.')
 
-    subjects = generate_subjects(user_count, rng=rng)
-    objects = generate_objects(resource_count, rng=rng)
-    actions = get_actions()
+    id_rng = get_id_rng(rng_seed)
+    workers = get_generation_workers(params)
+
+    if workers is None:
+        subjects = generate_subjects(user_count, rng=rng, id_rng=id_rng)
+        objects = generate_objects(resource_count, rng=rng, id_rng=id_rng)
+    else:
+        shard_size = get_generation_shard_size(params)
+        users, resources = generate_sharded_items(user_count, resource_count, rng_seed, workers, shard_size)
+        user_groups = get_user_groups(id_rng=id_rng)
+        assign_users(users, user_groups)
+        subjects = users + user_groups
+        resource_collections = get_resource_collections(id_rng=id_rng)
+        assign_resources(resources, resource_collections)
+        objects = resources + resource_collections
+
+    actions = get_actions(id_rng=id_rng)
     permissions = get_permissions(subjects, objects, actions)
     items = subjects + objects + actions + permissions
     assign_group_owners(items, rng=rng)
@@ -605,6 +835,76 @@ def generate_data():
     return data
 
 
+def get_member_additions(items, member_counts):
+    # Lists the members added to each item since its member count was taken, for the items that gained any.
+
+    additions = list()
+
+    for item in items:
+        if len(item['member']) > member_counts[item['uuid']]:
+            additions.append({'uuid': item['uuid'], 'member': item['member'][member_counts[item['uuid']]:]})
+
+    return additions
+
+
+def generate_delta(dataset, delta_name, user_count=None, resource_count=None):
+    # Grows a saved dataset by a number of new users and resources, and returns only the new and changed records.
+    # New users and resources are assigned to the existing groups and collections, and each new resource is given an
+    # owner and owner permissions as in a full generation. Existing groups and objects keep their owners.
+    # Added group and collection members are returned as records holding only a uuid and the new members.
+    # When a seed is set, each delta is seeded from it and the delta name, so regrowing a dataset is reproducible.
+
+    params = utilities.get_config_params('config.ini', 'data_growth')
+
+    if user_count is None:
+        user_count = int(params['user_count'])
+
+    if resource_count is None:
+        resource_count = int(params['resource_count'])
+
+    io_controller.out_info('Growing dataset', dataset.dataset_name + '...')
+
+    try:
+        rng_seed = int(utilities.get_config_params('config.ini', 'data_generation')['rng_seed'])
+        delta_seed = str(rng_seed) + '/' + dataset.dataset_name + '/' + delta_name
+        io_controller.out_debug('Using seed:', rng_seed)
+    except (KeyError, ValueError):
+        delta_seed = None
+        io_controller.out_debug('Using random seed.')
+
+    rng = Random(delta_seed)
+    id_rng = get_id_rng(delta_seed)
+
+    users = dataset['user']
+    user_groups = list(dict(group, member=list(group['member'])) for group in dataset['user_group'])
+    resources = dataset['resource']
+    resource_collections = list(dict(collection, member=list(collection['member'])) for collection in dataset['resource_collection'])
+    actions = dataset['operation'] + dataset['operation_set']
+    permissions = dataset['permission']
+    group_member_counts = {group['uuid']: len(group['member']) for group in user_groups}
+    collection_member_counts = {collection['uuid']: len(collection['member']) for collection in resource_collections}
+
+    new_users = generate_users(user_count, rng=rng, excluded_names=set(user['name'] for user in users), id_rng=id_rng)
+    assign_users(new_users, user_groups)
+    new_resources = generate_resources(resource_count, rng=rng, id_rng=id_rng)
+    assign_resources(new_resources, resource_collections)
+    items = users + new_users + user_groups + resources + new_resources + resource_collections + actions + permissions
+    assign_object_owners(items, rng=rng, objects=new_resources)
+    item_count = len(items)
+    assign_owner_permissions(items, objects=new_resources)
+    io_controller.out_info('Dataset growth complete.')
+
+    delta = {
+        'user': new_users,
+        'user_group_member': get_member_additions(user_groups, group_member_counts),
+        'resource': new_resources,
+        'resource_collection_member': get_member_additions(resource_collections, collection_member_counts),
+        'permission': items[item_count:]
+    }
+
+    return delta
+
+
 def get_last_auto_save_number():
     if not os.path.exists('data'):
         return 0
@@ -621,16 +921,245 @@ def get_last_auto_save_number():
     return sorted(auto_save_numbers)[-1]
 
 
-def save_data(data):
+def get_auto_save_names():
+    # Lists the auto saved datasets from oldest to newest.
+
     if not os.path.exists('data'):
-        os.makedirs('data')
+        return list()
+
+    auto_save_numbers = list()
+
+    for name in os.listdir('data'):
+        prefix, _, suffix = name.partition('_')
+
+        if prefix == 'auto' and suffix != '' and all(char in string.digits for char in suffix) and os.path.isdir('data/' + name):
+            auto_save_numbers.append(int(suffix))
+
+    return list('auto_' + str(number) for number in sorted(auto_save_numbers))
+
+
+def get_configured_dataset_name():
+    # Returns the dataset name set in the data storage section, or an empty string if datasets are auto saved.
 
     params = utilities.get_config_params('config.ini', 'data_storage')
 
     try:
-        dataset_name = params['dataset_name']
+        return params['dataset_name']
     except KeyError:
-        dataset_name = ''
+        return ''
+
+
+def get_generation_key(user_count=None, resource_count=None):
+    # Hashes everything that determines the content of a seeded dataset: the data generation parameters, the generator
+    # tables, the modules that generate from them, and today's date, which generated dates are drawn back from.
+    # The worker count is left out, as seeded output does not depend on it.
+    # Returns None if no seed is set, in which case every generated dataset is different and none can be reused.
+
+    params = utilities.get_config_params('config.ini', 'data_generation')
+
+    try:
+        int(params['rng_seed'])
+    except (KeyError, ValueError):
+        return None
+
+    key_params = {key: params[key] for key in params if key != 'workers'}
+
+    if user_count is not None:
+        key_params['user_count'] = str(user_count)
+
+    if resource_count is not None:
+        key_params['resource_count'] = str(resource_count)
+
+    generation_hash = hashlib.sha256()
+    generation_hash.update(json.dumps(key_params, sort_keys=True).encode())
+    generation_hash.update(str(datetime.date.today()).encode())
+
+    table_paths = list('generator_tables/' + name for name in sorted(os.listdir('generator_tables')))
+    module_paths = list((__file__, generator_tables.__file__, utilities.__file__))
+
+    for file_path in table_paths + module_paths:
+        generation_hash.update(os.path.basename(file_path).encode())
+
+        with open(file_path, 'rb') as file:
+            generation_hash.update(hashlib.sha256(file.read()).digest())
+
+    return generation_hash.hexdigest()
+
+
+def get_cached_generation_key(dataset_name):
+    # Returns the generation key recorded for a saved dataset, or None if it has none or cannot be read.
+    # Datasets that have since been grown with deltas no longer match the generated data, so have no key.
+
+    try:
+        with open('data/' + dataset_name + '/manifest.json', 'r') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if len(manifest.get('deltas', ())) != 0:
+        return None
+
+    return manifest.get('generation_key')
+
+
+def find_cached_dataset(generation_key):
+    # Returns the newest auto saved dataset generated with the given key, or None if there is none.
+
+    for dataset_name in reversed(get_auto_save_names()):
+        if get_cached_generation_key(dataset_name) == generation_key:
+            return dataset_name
+
+    return None
+
+
+def renew_cached_dataset(dataset_name):
+    # Renames a reused auto saved dataset to the next auto save number, so it is loaded as the latest dataset and the
+    # auto save numbers order the datasets by when they were last used.
+
+    if dataset_name == 'auto_' + str(get_last_auto_save_number()):
+        return dataset_name
+
+    renewed_name = 'auto_' + str(get_last_auto_save_number() + 1)
+    os.rename('data/' + dataset_name, 'data/' + renewed_name)
+    io_controller.out_debug('Dataset', dataset_name, 'renamed to', renewed_name)
+    return renewed_name
+
+
+def get_cache_size_limit():
+    params = utilities.get_config_params('config.ini', 'data_storage')
+
+    try:
+        size_limit = float(params['cache_size_limit_mb'])
+
+        if size_limit < 0:
+            raise ValueError
+
+        return int(size_limit * 1024 ** 2)
+    except (KeyError, ValueError):
+        return None
+
+
+def get_directory_size(directory_path):
+    return sum(os.path.getsize(directory_path + '/' + name) for name in os.listdir(directory_path) if os.path.isfile(directory_path + '/' + name))
+
+
+def evict_auto_saves(size_limit=None):
+    # Deletes the least recently used cached datasets until the cached datasets fit within the size limit.
+    # Only auto saves with a generation key and no deltas are cached, as only those can be generated again. Other auto
+    # saves are never evicted or counted. The latest auto save is always kept, as it is the dataset loaded next.
+
+    if size_limit is None:
+        size_limit = get_cache_size_limit()
+
+    if size_limit is None:
+        return
+
+    dataset_names = list(dataset_name for dataset_name in get_auto_save_names()[:-1] if get_cached_generation_key(dataset_name) is not None)
+    dataset_sizes = {dataset_name: get_directory_size('data/' + dataset_name) for dataset_name in dataset_names}
+    total_size = sum(dataset_sizes.values())
+
+    for dataset_name in dataset_names:
+        if total_size <= size_limit:
+            break
+
+        shutil.rmtree('data/' + dataset_name)
+        total_size -= dataset_sizes[dataset_name]
+        io_controller.out_info('Evicted cached dataset:', dataset_name)
+
+
+def get_shard_size():
+    params = utilities.get_config_params('config.ini', 'data_storage')
+
+    try:
+        shard_size = int(params['shard_size'])
+
+        if shard_size < 1:
+            raise ValueError
+
+        return shard_size
+    except (KeyError, ValueError):
+        return None
+
+
+def get_shard_file_name(key, shard_index):
+    return key + '.' + str(shard_index).zfill(5) + '.jsonl'
+
+
+def save_records(dataset_path, key, records, shard_size=None):
+    # Writes an iterable of records as newline-delimited JSON, one record per line, without holding them in memory.
+    # If a shard size is given, the records are split over numbered shard files of at most that many records each.
+    # Returns the manifest entry listing the record count and shard files.
+
+    shard_file_names = list()
+    count = 0
+    file = None
+
+    try:
+        for record in records:
+            if file is None or (shard_size is not None and count % shard_size == 0):
+                if file is not None:
+                    file.close()
+
+                shard_file_names.append(get_shard_file_name(key, len(shard_file_names)))
+                file = open(dataset_path + '/' + shard_file_names[-1], 'w')
+
+            file.write(json.dumps(record) + '\n')
+            count += 1
+    finally:
+        if file is not None:
+            file.close()
+
+    if len(shard_file_names) == 0:
+        shard_file_names.append(get_shard_file_name(key, 0))
+        open(dataset_path + '/' + shard_file_names[-1], 'w').close()
+
+    return {'count': count, 'shards': shard_file_names}
+
+
+def read_records(dataset_path, shard_file_names):
+    # Yields records lazily from a sequence of shard files.
+    # Shards in the original format, which hold a single JSON array, are parsed whole.
+
+    for shard_file_name in shard_file_names:
+        shard_path = dataset_path + '/' + shard_file_name
+
+        with open(shard_path, 'r') as file:
+            if shard_file_name.endswith('.jsonl'):
+                for line in file:
+                    if line.strip() != '':
+                        yield json.loads(line)
+            else:
+                yield from json.load(file)
+
+
+def save_manifest(dataset_path, manifest):
+    # The manifest is written last and replaced atomically, so a dataset is never left listing incomplete shards.
+    # Any data files from a previous save that are not listed in the new manifest are then removed.
+
+    manifest_path = dataset_path + '/manifest.json'
+
+    with open(manifest_path + '.tmp', 'w') as file:
+        json.dump(manifest, file, indent=2)
+
+    os.replace(manifest_path + '.tmp', manifest_path)
+    shard_file_names = set(name for key in manifest['keys'] for name in manifest['keys'][key]['shards'])
+
+    for delta in manifest.get('deltas', ()):
+        shard_file_names.update(name for key in delta['keys'] for name in delta['keys'][key]['shards'])
+
+    for file_name in os.listdir(dataset_path):
+        if file_name.endswith(('.json', '.jsonl')) and file_name != 'manifest.json' and file_name not in shard_file_names:
+            os.remove(dataset_path + '/' + file_name)
+
+
+def save_data(data, dataset_name=None, generation_key=None):
+    # If a generation key is given, it is recorded in the manifest so that the dataset can be reused by later runs.
+
+    if not os.path.exists('data'):
+        os.makedirs('data')
+
+    if dataset_name is None:
+        dataset_name = get_configured_dataset_name()
 
     if dataset_name == '':
         dataset_name = 'auto_' + str(get_last_auto_save_number() + 1)
@@ -646,43 +1175,157 @@ def save_data(data):
             io_controller.out_warn('Overwriting previous dataset.')
         else:
             io_controller.out_warn('Dataset save aborted.')
-            return
+            return None
+
+    shard_size = get_shard_size()
+    manifest = {'format': 'jsonl', 'shard_size': shard_size, 'keys': dict()}
+
+    if generation_key is not None:
+        manifest['generation_key'] = generation_key
 
     for key in data:
-        file_path = dataset_path + '/' + key + '.json'
+        manifest['keys'][key] = save_records(dataset_path, key, data[key], shard_size=shard_size)
+        io_controller.out_debug(key, 'data saved to', len(manifest['keys'][key]['shards']), 'shards under', dataset_path)
 
-        with open(file_path, 'w') as file:
-            json.dump(data[key], file, indent=2)
+    save_manifest(dataset_path, manifest)
+    return dataset_name
 
-        io_controller.out_debug(key, 'data saved to', file_path)
 
+def get_next_delta_name(dataset):
+    return 'delta_' + str(len(dataset.get_deltas()) + 1).zfill(5)
 
-def load_data():
-    params = utilities.get_config_params('config.ini', 'data_storage')
 
-    try:
-        dataset_name = params['dataset_name']
-    except KeyError:
-        dataset_name = ''
+def save_delta(dataset, delta_name, delta):
+    # Writes the records of a delta to their own shard files alongside the dataset, and appends the delta to the manifest.
+    # Shard files are prefixed with the delta name, so they never replace the files of the dataset or of earlier deltas.
 
-    if dataset_name == '':
-        dataset_name = 'auto_' + str(get_last_auto_save_number())
+    manifest = copy.deepcopy(dataset.get_manifest())
+    shard_size = get_shard_size()
+    delta_entry = {'name': delta_name, 'keys': dict()}
 
-    dataset_path = 'data/' + dataset_name
-    data = dict()
+    for key in delta:
+        delta_entry['keys'][key] = save_records(dataset.dataset_path, delta_name + '.' + key, delta[key], shard_size=shard_size)
+        io_controller.out_debug(key, 'delta saved to', len(delta_entry['keys'][key]['shards']), 'shards under', dataset.dataset_path)
 
-    try:
-        for file_name in os.listdir(dataset_path):
-            key = file_name.rpartition('.')[0]
-            file_path = dataset_path + '/' + file_name
+    manifest.setdefault('deltas', list()).append(delta_entry)
+    save_manifest(dataset.dataset_path, manifest)
+    return delta_name
+
+
+class Dataset:
+    # A handle on a saved dataset that is passed to the data loaders in place of the parsed data.
+    # Each entity kind is parsed from disk the first time it is accessed, and is then cached for subsequent accesses.
+    # A cached entity kind is only parsed again if one of its files on disk has since been modified.
+    # Records can also be streamed from disk without being cached, for callers that only need a single pass.
+    # Any deltas listed in the manifest are merged in order: their new records follow those of the dataset, and their
+    # added members are appended to the members of the existing records they refer to.
+
+    def __init__(self, dataset_name=None):
+        if dataset_name is None:
+            dataset_name = get_configured_dataset_name()
+
+        if dataset_name == '':
+            dataset_name = 'auto_' + str(get_last_auto_save_number())
+
+        self.dataset_name = dataset_name
+        self.dataset_path = 'data/' + dataset_name
+        self.manifest = None
+        self.manifest_stamp = None
+        self.cache = dict()
+        self.file_stamps = dict()
+
+        if not os.path.isdir(self.dataset_path):
+            io_controller.out_error('No dataset with the name', dataset_name, 'was found.')
+            io_controller.out_error('Data should be stored under:', os.getcwd() + '/data')
+            raise FileNotFoundError(self.dataset_path)
+
+    def get_file_stamp(self, file_name):
+        file_stat = os.stat(self.dataset_path + '/' + file_name)
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def get_manifest(self):
+        # Datasets saved before the manifest was introduced hold one JSON array file per key, with no record counts.
+
+        try:
+            manifest_stamp = self.get_file_stamp('manifest.json')
+        except FileNotFoundError:
+            file_names = sorted(name for name in os.listdir(self.dataset_path) if name.endswith('.json'))
+            return {'format': 'json', 'keys': {name.rpartition('.')[0]: {'count': None, 'shards': [name]} for name in file_names}}
+
+        if manifest_stamp != self.manifest_stamp:
+            with open(self.dataset_path + '/manifest.json', 'r') as file:
+                self.manifest = json.load(file)
+
+            self.manifest_stamp = manifest_stamp
+
+        return self.manifest
+
+    def keys(self):
+        return list(self.get_manifest()['keys'])
+
+    def get_deltas(self):
+        return self.get_manifest().get('deltas', list())
+
+    def get_delta_shard_file_names(self, key):
+        return list(name for delta in self.get_deltas() if key in delta['keys'] for name in delta['keys'][key]['shards'])
+
+    def get_shard_file_names(self, key):
+        shard_file_names = self.get_manifest()['keys'][key]['shards']
+        return shard_file_names + self.get_delta_shard_file_names(key) + self.get_delta_shard_file_names(key + '_member')
 
-            with open(file_path, 'r') as file:
-                data[key] = json.load(file)
+    def count(self, key):
+        count = self.get_manifest()['keys'][key]['count']
 
-            io_controller.out_debug(key, 'data loaded from', file_path)
+        if count is None:
+            return len(self[key])
 
-        return data
+        return count + sum(delta['keys'][key]['count'] for delta in self.get_deltas() if key in delta['keys'])
+
+    def merge_records(self, key):
+        member_additions = dict()
+
+        for record in read_records(self.dataset_path, self.get_delta_shard_file_names(key + '_member')):
+            member_additions.setdefault(record['uuid'], list()).extend(record['member'])
+
+        for record in read_records(self.dataset_path, self.get_manifest()['keys'][key]['shards']):
+            if len(member_additions) != 0 and record.get('uuid') in member_additions:
+                record['member'] = record['member'] + member_additions[record['uuid']]
+
+            yield record
+
+        yield from read_records(self.dataset_path, self.get_delta_shard_file_names(key))
+
+    def stream(self, key):
+        return self.merge_records(key)
+
+    def get_delta(self, delta_name=None):
+        # Returns the records of a single delta by key, defaulting to the most recent delta, or None if there is none.
+
+        for delta in reversed(self.get_deltas()):
+            if delta_name is None or delta['name'] == delta_name:
+                return {key: list(read_records(self.dataset_path, delta['keys'][key]['shards'])) for key in delta['keys']}
+
+        return None
+
+    def __getitem__(self, key):
+        try:
+            shard_file_names = self.get_shard_file_names(key)
+            file_stamp = tuple(self.get_file_stamp(file_name) for file_name in shard_file_names)
+        except FileNotFoundError:
+            raise KeyError(key)
+
+        if self.file_stamps.get(key) != file_stamp:
+            self.cache[key] = list(self.merge_records(key))
+            self.file_stamps[key] = file_stamp
+            io_controller.out_debug(key, 'data loaded from', len(shard_file_names), 'shards under', self.dataset_path)
+
+        return self.cache[key]
+
+
+def load_data():
+    try:
+        dataset = Dataset()
     except FileNotFoundError:
-        io_controller.out_error('No dataset with the name', dataset_name, 'was found.')
-        io_controller.out_error('Data should be stored under:', os.getcwd() + '/data')
         return
+
+    return {key: dataset[key] for key in dataset.keys()}
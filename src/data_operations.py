@@ -1,6 +1,39 @@
+import src.io_controller as io_controller
 import src.data_generation as data_generation
 
 
-def generate_new_dataset():
-    data = data_generation.generate_data()
-    data_generation.save_data(data)
+def generate_new_dataset(user_count=None, resource_count=None):
+    # Seeded datasets are cached when auto saving: a previous auto save generated from the same parameters, seed,
+    # generator tables and date is reused rather than generated again, and old auto saves are evicted by size.
+
+    if data_generation.get_configured_dataset_name() != '':
+        data = data_generation.generate_data(user_count=user_count, resource_count=resource_count)
+        return data_generation.save_data(data)
+
+    generation_key = data_generation.get_generation_key(user_count=user_count, resource_count=resource_count)
+    dataset_name = None
+
+    if generation_key is not None:
+        dataset_name = data_generation.find_cached_dataset(generation_key)
+
+    if dataset_name is None:
+        data = data_generation.generate_data(user_count=user_count, resource_count=resource_count)
+        dataset_name = data_generation.save_data(data, generation_key=generation_key)
+    else:
+        io_controller.out_info('Reusing cached dataset:', dataset_name)
+        dataset_name = data_generation.renew_cached_dataset(dataset_name)
+
+    data_generation.evict_auto_saves()
+    return dataset_name
+
+
+def grow_dataset(user_count=None, resource_count=None, dataset_name=None):
+    try:
+        dataset = data_generation.Dataset(dataset_name)
+    except FileNotFoundError:
+        io_controller.out_info('Dataset growth aborted.')
+        return None
+
+    delta_name = data_generation.get_next_delta_name(dataset)
+    delta = data_generation.generate_delta(dataset, delta_name, user_count=user_count, resource_count=resource_count)
+    return data_generation.save_delta(dataset, delta_name, delta)
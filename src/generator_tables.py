@@ -0,0 +1,110 @@
+import json
+import types
+
+tables = dict()
+views = dict()
+
+
+def freeze(value):
+    # Recursively converts parsed table data into read-only mappings and tuples.
+    # Tables are shared by every caller in the process, so they are frozen to prevent one caller mutating another's data.
+
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: freeze(value[key]) for key in value})
+    elif isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    else:
+        return value
+
+
+def thaw(value):
+    # Recursively converts frozen table data back into mutable dicts and lists, for callers that modify the data.
+
+    if isinstance(value, types.MappingProxyType):
+        return {key: thaw(value[key]) for key in value}
+    elif isinstance(value, tuple):
+        return list(thaw(item) for item in value)
+    else:
+        return value
+
+
+def get_table(file_name):
+    # Parses a generator table on first use and caches it for the lifetime of the process.
+
+    if file_name not in tables:
+        with open('generator_tables/' + file_name, 'r') as file:
+            if file_name.endswith('.json'):
+                table = json.load(file)
+            else:
+                table = file.read().split('\n')
+
+        tables[file_name] = freeze(table)
+
+    return tables[file_name]
+
+
+def get_view(view_key, filter_function, file_name):
+    # Filters a generator table on first use and caches the filtered view under the given key.
+
+    if view_key not in views:
+        views[view_key] = tuple(item for item in get_table(file_name) if filter_function(item))
+
+    return views[view_key]
+
+
+def get_name_table(name_type):
+    # Name lists taken from: https://github.com/treyhunner/names/
+    # Licensed under the MIT License.
+    # Returns a tuple of names and a matching tuple of cumulative weights.
+
+    view_key = ('names', name_type)
+
+    if view_key not in views:
+        names = list()
+        cumulatives = list()
+
+        for line in get_table(name_type + '_names.tsv'):
+            if line == '':
+                continue
+
+            name, weight, cumulative, rank = line.split('\t')
+            names.append(name)
+            cumulatives.append(float(cumulative))
+
+        views[view_key] = (tuple(names), tuple(cumulatives))
+
+    return views[view_key]
+
+
+def get_banned_strings():
+    return get_table('banned_strings.tsv')
+
+
+def get_user_group_table(group_type='user_group', get_abstract_groups=True):
+    view_key = ('user_groups', group_type, get_abstract_groups)
+    filter_function = lambda group: group_type in group['type'] and (get_abstract_groups or not group['is_abstract'])
+    return get_view(view_key, filter_function, 'user_groups.json')
+
+
+def get_resource_collection_table(collection_type='resource_collection', get_abstract_collections=True):
+    view_key = ('resource_collections', collection_type, get_abstract_collections)
+    filter_function = lambda collection: collection_type in collection['type'] and (get_abstract_collections or not collection['is_abstract'])
+    return get_view(view_key, filter_function, 'resource_collections.json')
+
+
+def get_operation_table(object_type=None):
+    view_key = ('operations', object_type)
+    filter_function = lambda operation: object_type is None or object_type in operation['object_type']
+    return get_view(view_key, filter_function, 'operations.json')
+
+
+def get_operation_set_table(object_type=None):
+    view_key = ('operation_sets', object_type)
+    filter_function = lambda opset: object_type is None or object_type in opset['object_type']
+    return get_view(view_key, filter_function, 'operation_sets.json')
+
+
+def get_permission_table(subject_type=None, object_type=None):
+    view_key = ('permissions', subject_type, object_type)
+    filter_function = lambda permission: (subject_type is None or subject_type == permission['subject_type']) and (object_type is None or object_type == permission['object_type'])
+    return get_view(view_key, filter_function, 'permissions.json')
@@ -1,6 +1,9 @@
+import atexit
 import datetime
 import os
 import sys
+import threading
+import time
 import src.utilities as utilities
 
 
@@ -24,6 +27,90 @@ def get_output_level(level_type):
         return 5
 
 
+class Logger:
+    # Resolves display and logging levels from the config once, rather than on every output call.
+    # Keeps the current log file open and buffers entries, flushing at most once per flush interval as well as when the
+    # log is closed. Levels and the log file are re-read from disk on reload. Safe to call from multiple threads.
+
+    def __init__(self, flush_interval=1.0):
+        self.lock = threading.RLock()
+        self.levels = dict()
+        self.log_file = None
+        self.inherited_log_file = None
+        self.flush_interval = flush_interval
+        self.last_flush_time = time.monotonic()
+
+    def get_level(self, level_type):
+        with self.lock:
+            if level_type not in self.levels:
+                self.levels[level_type] = get_output_level(level_type)
+
+            return self.levels[level_type]
+
+    def open_log(self, log_path):
+        with self.lock:
+            self.close()
+            self.log_file = open(log_path, 'a')
+            self.last_flush_time = time.monotonic()
+
+    def write(self, entry):
+        with self.lock:
+            if self.log_file is None:
+                try:
+                    last_log = sorted(os.listdir('logs'))[-1]
+                except (FileNotFoundError, IndexError):
+                    create_log()
+                    last_log = sorted(os.listdir('logs'))[-1]
+
+                self.open_log('logs/' + last_log)
+
+            self.log_file.write(entry + '\n')
+
+            if time.monotonic() - self.last_flush_time >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.log_file is not None:
+                self.log_file.flush()
+
+            self.last_flush_time = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self.log_file is not None:
+                self.log_file.close()
+                self.log_file = None
+
+    def reload(self):
+        with self.lock:
+            self.levels = dict()
+            self.close()
+
+    def silence(self):
+        # Limits output to fatal entries, for worker processes whose progress is reported by their parent.
+
+        with self.lock:
+            self.levels = {'display': 0, 'logging': 0}
+
+    def reset_after_fork(self):
+        # A forked child inherits the open log file, and a lock that may have been held by another thread of the parent.
+        # The lock is replaced, and the child opens its own log file on its next entry. The inherited file is kept but
+        # never written, so that none of the parent's entries are written again from the child.
+
+        self.lock = threading.RLock()
+        self.inherited_log_file = self.log_file
+        self.log_file = None
+        self.last_flush_time = time.monotonic()
+
+
+logger = Logger()
+atexit.register(logger.close)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=logger.flush, after_in_child=logger.reset_after_fork)
+
+
 def create_log():
     if not os.path.exists('logs'):
         os.makedirs('logs')
@@ -33,16 +120,19 @@ def create_log():
     with open('logs/' + log_name + '.log', 'a'):
         pass
 
+    logger.close()
+
 
 def write_to_last_log(entry):
-    try:
-        last_log = sorted(os.listdir('logs'))[-1]
-    except FileNotFoundError or IndexError:
-        create_log()
-        last_log = sorted(os.listdir('logs'))[-1]
+    logger.write(entry)
+
 
-    with open('logs/' + last_log, 'a') as log:
-        log.write(entry + '\n')
+def flush_log():
+    logger.flush()
+
+
+def silence_output():
+    logger.silence()
 
 
 def in_raw(prompt, no_log=False):
@@ -60,10 +150,10 @@ def in_input(prompt, no_log=False):
 
 
 def out_raw(*args, log_level=-1, no_log=False, sep=' ', **kwargs):
-    if log_level <= get_output_level(level_type='display'):
+    if log_level <= logger.get_level(level_type='display'):
         print(*args, sep=sep, **kwargs)
 
-    if log_level <= get_output_level(level_type='logging') and not no_log:
+    if log_level <= logger.get_level(level_type='logging') and not no_log:
         entry = str(datetime.datetime.now()) + ' ' + sep.join(list(str(arg) for arg in args))
         write_to_last_log(entry)
 
@@ -119,7 +209,10 @@ def get_out_function(level):
 
 
 class ProgressBar:
-    def __init__(self, total_steps, out_level='info', sigfig=2, display=True):
+    # Renders at most max_render_rate times per second, or if render_percent is given, every time progress advances by
+    # that percentage. Starting and finishing states are always rendered. Safe to advance from multiple threads.
+
+    def __init__(self, total_steps, out_level='info', sigfig=2, display=True, max_render_rate=10, render_percent=None):
         self.current_step = 0
         self.total_steps = total_steps
         self.start_time = datetime.datetime.now()
@@ -128,29 +221,53 @@ class ProgressBar:
         self.sigfig = sigfig
         self.last_print_length = 0
         self.locked = not display
+        self.max_render_rate = max_render_rate
+        self.render_percent = render_percent
+        self.last_render_time = None
+        self.last_render_step = 0
+        self.mutex = threading.RLock()
 
     def get_progress(self):
-        return self.current_step, self.total_steps
+        with self.mutex:
+            return self.current_step, self.total_steps
 
-    def __output_progress(self, no_log=True):
-        if not self.locked:
+    def __get_fraction(self):
+        if self.total_steps == 0:
+            return 1.0
+
+        return min(1.0, self.current_step / self.total_steps)
+
+    def __render_due(self):
+        if self.last_render_time is None:
+            return True
+        elif self.render_percent is not None:
+            return 100 * (self.current_step - self.last_render_step) >= self.render_percent * self.total_steps
+        else:
+            return time.monotonic() - self.last_render_time >= 1 / self.max_render_rate
+
+    def __output_progress(self, no_log=True, force=True):
+        if not self.locked and (force or self.__render_due()):
             out_function = get_out_function(self.out_level)
-            bar = '|' + '█' * int(50 * self.current_step // self.total_steps) + '-' * (50 - int(50 * self.current_step // self.total_steps)) + '|'
-            progress = str(utilities.intsigfig(100 * self.current_step / self.total_steps, self.sigfig)) + '%'
+            fraction = self.__get_fraction()
+            bar = '|' + '█' * int(50 * fraction) + '-' * (50 - int(50 * fraction)) + '|'
+            progress = str(utilities.intsigfig(100 * fraction, self.sigfig)) + '%'
+            self.current_time = datetime.datetime.now()
 
             if self.current_step == 0 or self.start_time == self.current_time:
                 progress_bar = 'Progress: ' + bar + ' ' + progress
                 out_function(progress_bar + ' ' * max(0, self.last_print_length - len(progress_bar)), end='\r', no_log=no_log)
                 print_length = max(self.last_print_length, len(progress_bar))
             else:
-                elapsed_time = utilities.format_time(int(round((self.current_time - self.start_time).total_seconds())))
-                remaining_time = utilities.format_time(int(round((self.total_steps - self.current_step) * (self.current_time - self.start_time).total_seconds() / self.current_step)))
+                elapsed_seconds = (self.current_time - self.start_time).total_seconds()
+                elapsed_time = utilities.format_time(int(round(elapsed_seconds)))
+                remaining_time = utilities.format_time(int(round(max(0, self.total_steps - self.current_step) * elapsed_seconds / self.current_step)))
                 progress_bar = 'Progress: ' + bar + ' ' + progress + '   Elapsed: ' + elapsed_time + '   Remaining: ' + remaining_time
                 out_function(progress_bar + ' ' * max(0, self.last_print_length - len(progress_bar)), end='\r', no_log=no_log)
                 print_length = max(self.last_print_length, len(progress_bar))
 
-            self.current_time = datetime.datetime.now()
             self.last_print_length = print_length
+            self.last_render_time = time.monotonic()
+            self.last_render_step = self.current_step
             return True
         else:
             return False
@@ -164,15 +281,17 @@ class ProgressBar:
             return False
 
     def lock(self):
-        self.__output_progress(no_log=False)
-        self.__output_newline()
-        self.locked = True
-        return self
+        with self.mutex:
+            self.__output_progress(no_log=False)
+            self.__output_newline()
+            self.locked = True
+            return self
 
     def terminate(self):
-        self.current_step = self.total_steps
-        self.lock()
-        return self
+        with self.mutex:
+            self.current_step = self.total_steps
+            self.lock()
+            return self
 
     def __terminate_if_full(self):
         if self.current_step >= self.total_steps:
@@ -181,21 +300,27 @@ class ProgressBar:
         else:
             return False
 
+    def advance(self, steps):
+        with self.mutex:
+            self.current_step += steps
+            self.__terminate_if_full()
+            self.__output_progress(force=False)
+            return self
+
     def increment(self):
-        self.current_step += 1
-        self.__terminate_if_full()
-        self.__output_progress()
-        return self
+        return self.advance(1)
 
     def set_step(self, step):
-        self.current_step = step
-        self.__terminate_if_full()
-        self.__output_progress()
-        return self
+        with self.mutex:
+            self.current_step = step
+            self.__terminate_if_full()
+            self.__output_progress(force=False)
+            return self
 
     def __enter__(self):
-        self.__output_progress()
-        return self
+        with self.mutex:
+            self.__output_progress()
+            return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.lock()
@@ -6,18 +6,43 @@ def poly_reg(x, y, m):
     # Performs polynomial regression of degree m by least squares estimation for two variable lists x and y.
     # Returns a list of polynomial coefficients p where: y = sum_i( p[i] * x ** i )
 
-    X = list()
+    X = numpy.vander(numpy.asarray(x, dtype=float), m + 1, increasing=True)
+    return numpy.linalg.lstsq(X, numpy.asarray(y, dtype=float), rcond=None)[0].tolist()
 
-    for xi in x:
-        X.append(list())
 
-        for j in range(m + 1):
-            X[-1].append(xi ** j)
+def poly_reg_batch(xs, ys, m):
+    # Performs polynomial regression of degree m by least squares estimation for each pair of variable lists in xs and ys.
+    # Series of equal length are solved together by a stacked QR decomposition of their Vandermonde matrices.
+    # Series whose R factor has a diagonal entry near zero are rank-deficient, and are solved by poly_reg instead, as
+    #   are all series if their lengths differ or they have fewer points than coefficients.
+    # Returns a list with a list of polynomial coefficients p for each series, where: y = sum_i( p[i] * x ** i )
 
-    XT = numpy.transpose(numpy.array(X))
-    XTXi = numpy.linalg.inv(numpy.dot(XT, numpy.array(X)))
-    XTXiXT = numpy.dot(XTXi, XT)
-    return numpy.dot(XTXiXT, numpy.array(y)).tolist()
+    if len(xs) == 0:
+        return list()
+
+    lengths = set(len(x) for x in xs) | set(len(y) for y in ys)
+
+    if len(lengths) != 1 or min(lengths) < m + 1:
+        return list(poly_reg(x, y, m) for x, y in zip(xs, ys))
+
+    X = numpy.stack(list(numpy.vander(numpy.asarray(x, dtype=float), m + 1, increasing=True) for x in xs))
+    Q, R = numpy.linalg.qr(X)
+    QTy = numpy.matmul(numpy.swapaxes(Q, -1, -2), numpy.asarray(ys, dtype=float)[..., numpy.newaxis])
+    R_diagonal = numpy.abs(numpy.diagonal(R, axis1=-2, axis2=-1))
+    tolerance = numpy.finfo(float).eps * max(X.shape[1:]) * numpy.max(R_diagonal, axis=-1)
+    full_rank = numpy.all(R_diagonal > tolerance[:, numpy.newaxis], axis=-1)
+    polys = list(None for _ in xs)
+
+    if numpy.any(full_rank):
+        solutions = numpy.linalg.solve(R[full_rank], QTy[full_rank])[..., 0].tolist()
+
+        for i, poly in zip(numpy.flatnonzero(full_rank).tolist(), solutions):
+            polys[i] = poly
+
+    for i in numpy.flatnonzero(~full_rank).tolist():
+        polys[i] = poly_reg(xs[i], ys[i], m)
+
+    return polys
 
 
 def lin_reg(x, y):
@@ -39,8 +64,10 @@ def coef_det(y, f):
     # Calculates the coefficient of determination R² for a list of variables y and its predictor f.
     # Returns the coefficient R².
 
-    Sr = sum(list((yi - fi) ** 2 for yi, fi in zip(y, f)))
-    St = sum(list((yi - sum(y) / len(y)) ** 2 for yi in y))
+    y = numpy.asarray(y, dtype=float)
+    f = numpy.asarray(f, dtype=float)
+    Sr = float(numpy.sum((y - f) ** 2))
+    St = float(numpy.sum((y - numpy.mean(y)) ** 2))
     return 1 - Sr / St
 
 
@@ -58,7 +85,7 @@ def poly_fit(x, y, R2min, mmin=0, mmax=math.inf):
 
     while m < min(len(y), mmax + 1):
         poly = poly_reg(x, y, m)
-        f = list(sum(list(poly[i] * xi ** i for i in range(len(poly)))) for xi in x)
+        f = poly_eval(poly, x)
         R2 = coef_det(y, f)
         polys.append(poly)
         R2s.append(R2)
@@ -73,11 +100,26 @@ def poly_fit(x, y, R2min, mmin=0, mmax=math.inf):
     return poly, R2
 
 
+def poly_eval(poly, x):
+    # Evaluates a polynomial f(x) by Horner's method over an array of values x, given a list of polynomial coefficients p
+    #   where: f(x) = sum_i( p[i] * x ** i )
+    # Returns an array of values f.
+
+    return numpy.polynomial.polynomial.polyval(numpy.asarray(x, dtype=float), numpy.asarray(poly, dtype=float))
+
+
 def poly_point(poly, x):
     # Calculates f for a polynomial f(x) given a value x and a list of polynomial coefficients p where: f(x) = sum_i( p[i] * x ** i )
     # Returns the value f.
 
-    return sum(list(poly[i] * x ** i for i in range(len(poly))))
+    return float(poly_eval(poly, x))
+
+
+def poly_points(poly, x):
+    # Calculates f for a polynomial f(x) given a list of values x and a list of polynomial coefficients p where: f(x) = sum_i( p[i] * x ** i )
+    # Returns the list of values f.
+
+    return poly_eval(poly, x).tolist()
 
 
 def poly_roots(poly):
@@ -1,53 +1,226 @@
 import src.io_controller as io_controller
 import src.postgres_iam.db_controller as db_controller
-import src.data_generation as data_generation
 
 
-def load_users(client):
-    pass
+def create_keys():
+    # Serial keys are assigned in memory as items are loaded, rather than returned from the database row by row.
+    # Subjects, objects, actions and accesses each have their own key space, matching the SERIAL columns in the schema.
 
+    return {'subject': dict(), 'object': dict(), 'action': dict(), 'access': dict()}
 
-def load_user_groups(client):
-    pass
 
+def assign_keys(items, key_map):
+    for item in items:
+        if item['uuid'] not in key_map:
+            key_map[item['uuid']] = len(key_map) + 1
 
-def load_subjects(client):
-    load_users(client)
-    load_user_groups(client)
 
+def get_membership_rows(parents, parent_keys, member_keys):
+    for parent in parents:
+        for member_uuid in dict.fromkeys(parent['member']):
+            if member_uuid in member_keys:
+                yield parent_keys[parent['uuid']], member_keys[member_uuid]
 
-def load_resources(client):
-    pass
 
+def get_ownership_rows(owned_items, owned_keys, owner_keys):
+    for item in owned_items:
+        for owner_uuid in dict.fromkeys(item['owner']):
+            if owner_uuid in owner_keys:
+                yield owned_keys[item['uuid']], owner_keys[owner_uuid], 'owner'
 
-def load_resource_collections(client):
-    pass
 
+def load_users(client, dataset, keys):
+    users = dataset['user']
+    subject_keys = keys['subject']
+    assign_keys(users, subject_keys)
+    io_controller.out_info('Loading', len(users), 'users.')
+    db_controller.copy_rows(client, 'subject', ['id'], ((subject_keys[user['uuid']],) for user in users))
+    db_controller.copy_rows(client, 'users', ['id'], ((subject_keys[user['uuid']],) for user in users))
+    db_controller.copy_rows(client, 'person', ['id', 'name', 'email'], ((subject_keys[user['uuid']], user['name'], user['email']) for user in users))
 
-def load_objects(client):
-    load_resources(client)
-    load_resource_collections(client)
 
+def load_user_groups(client, dataset, keys):
+    user_groups = dataset['user_group']
+    subject_keys = keys['subject']
+    assign_keys(user_groups, subject_keys)
+    io_controller.out_info('Loading', len(user_groups), 'user groups.')
+    db_controller.copy_rows(client, 'subject', ['id'], ((subject_keys[group['uuid']],) for group in user_groups))
+    db_controller.copy_rows(client, 'user_group', ['id'], ((subject_keys[group['uuid']],) for group in user_groups))
 
-def load_operations(client):
-    pass
+    for group_type, identifier_type in (('business_unit', 'name'), ('user_role', 'name'), ('user_account', 'email')):
+        groups = list(group for group in user_groups if group_type in group['type'])
+        db_controller.copy_rows(client, group_type, ['id', identifier_type], ((subject_keys[group['uuid']], group['name']) for group in groups))
 
+    io_controller.out_info('Loading group memberships.')
+    db_controller.copy_rows(client, 'group_membership', ['user_group', 'group_member'], get_membership_rows(user_groups, subject_keys, subject_keys))
+    io_controller.out_info('Loading group ownerships.')
+    db_controller.copy_rows(client, 'group_ownership', ['owned_group', 'group_owner', 'ownership_type'], get_ownership_rows(user_groups, subject_keys, subject_keys))
 
-def load_operation_sets(client):
-    pass
 
+def load_subjects(client, dataset, keys):
+    load_users(client, dataset, keys)
+    load_user_groups(client, dataset, keys)
 
-def load_actions(client):
-    load_operations(client)
-    load_operation_sets(client)
 
+def load_object_types(client, objects, object_keys):
+    rows = ((object_keys[obj['uuid']], object_type) for obj in objects for object_type in dict.fromkeys(obj['type']))
+    db_controller.copy_rows(client, 'object_type', ['object', 'object_type'], rows)
 
-def load_permissions(client):
-    pass
 
+def load_resources(client, dataset, keys):
+    resources = dataset['resource']
+    object_keys = keys['object']
+    assign_keys(resources, object_keys)
+    io_controller.out_info('Loading', len(resources), 'resources.')
+    db_controller.copy_rows(client, 'object', ['id'], ((object_keys[resource['uuid']],) for resource in resources))
+    load_object_types(client, resources, object_keys)
+    db_controller.copy_rows(client, 'resource', ['id'], ((object_keys[resource['uuid']],) for resource in resources))
+    db_controller.copy_rows(client, 'file', ['id', 'filepath'], ((object_keys[resource['uuid']], resource['name']) for resource in resources))
 
-def load_data(client):
-    load_subjects(client)
-    load_objects(client)
-    load_actions(client)
-    load_permissions(client)
+
+def load_resource_collections(client, dataset, keys):
+    resource_collections = dataset['resource_collection']
+    object_keys = keys['object']
+    assign_keys(resource_collections, object_keys)
+    io_controller.out_info('Loading', len(resource_collections), 'resource collections.')
+    db_controller.copy_rows(client, 'object', ['id'], ((object_keys[collection['uuid']],) for collection in resource_collections))
+    load_object_types(client, resource_collections, object_keys)
+    db_controller.copy_rows(client, 'resource_collection', ['id'], ((object_keys[collection['uuid']],) for collection in resource_collections))
+    db_controller.copy_rows(client, 'directory', ['id', 'filepath'], ((object_keys[collection['uuid']], collection['name']) for collection in resource_collections))
+    io_controller.out_info('Loading collection memberships.')
+    db_controller.copy_rows(client, 'collection_membership', ['resource_collection', 'collection_member'], get_membership_rows(resource_collections, object_keys, object_keys))
+
+
+def load_object_ownerships(client, dataset, keys):
+    objects = dataset['resource'] + dataset['resource_collection']
+    io_controller.out_info('Loading object ownerships.')
+    db_controller.copy_rows(client, 'object_ownership', ['owned_object', 'object_owner', 'ownership_type'], get_ownership_rows(objects, keys['object'], keys['subject']))
+
+
+def load_objects(client, dataset, keys):
+    load_resources(client, dataset, keys)
+    load_resource_collections(client, dataset, keys)
+    load_object_ownerships(client, dataset, keys)
+
+
+def load_action_items(client, actions, action_keys, action_table):
+    assign_keys(actions, action_keys)
+    db_controller.copy_rows(client, 'actions', ['id', 'name'], ((action_keys[action['uuid']], action['name']) for action in actions))
+    rows = ((action_keys[action['uuid']], object_type) for action in actions for object_type in dict.fromkeys(action['object_type']))
+    db_controller.copy_rows(client, 'action_type', ['action_id', 'object_type'], rows)
+    db_controller.copy_rows(client, action_table, ['id'], ((action_keys[action['uuid']],) for action in actions))
+
+
+def load_operations(client, dataset, keys):
+    operations = dataset['operation']
+    io_controller.out_info('Loading', len(operations), 'operations.')
+    load_action_items(client, operations, keys['action'], 'operation')
+
+
+def load_operation_sets(client, dataset, keys):
+    operation_sets = dataset['operation_set']
+    action_keys = keys['action']
+    io_controller.out_info('Loading', len(operation_sets), 'operation sets.')
+    load_action_items(client, operation_sets, action_keys, 'operation_set')
+    io_controller.out_info('Loading set memberships.')
+    db_controller.copy_rows(client, 'set_membership', ['operation_set', 'set_member'], get_membership_rows(operation_sets, action_keys, action_keys))
+
+
+def assign_access_key(object_key, action_key, access_keys):
+    if (object_key, action_key) not in access_keys:
+        access_keys[(object_key, action_key)] = len(access_keys) + 1
+
+    return access_keys[(object_key, action_key)]
+
+
+def load_accesses(client, dataset, keys):
+    # An access is valid for each object and action that share an object type, as in the TypeDB loader.
+    # Any further accesses referenced by permissions are added before the accesses are copied.
+
+    objects = dataset['resource'] + dataset['resource_collection']
+    actions = dataset['operation'] + dataset['operation_set']
+    object_keys = keys['object']
+    action_keys = keys['action']
+    access_keys = keys['access']
+    actions_by_object_type = dict()
+
+    for action in actions:
+        for object_type in dict.fromkeys(action['object_type']):
+            actions_by_object_type.setdefault(object_type, list()).append(action)
+
+    for obj in objects:
+        accessible_actions = dict()
+
+        for object_type in obj['type']:
+            for action in actions_by_object_type.get(object_type, ()):
+                accessible_actions[action['uuid']] = action
+
+        for action_uuid in accessible_actions:
+            assign_access_key(object_keys[obj['uuid']], action_keys[action_uuid], access_keys)
+
+    for permission in dataset['permission']:
+        for object_uuid in permission['object']:
+            for action_uuid in permission['action']:
+                if object_uuid in object_keys and action_uuid in action_keys:
+                    assign_access_key(object_keys[object_uuid], action_keys[action_uuid], access_keys)
+
+    io_controller.out_info('Loading', len(access_keys), 'accesses.')
+    rows = ((access_keys[pair], pair[0], pair[1]) for pair in access_keys)
+    db_controller.copy_rows(client, 'access', ['id', 'accessed_object', 'valid_action'], rows)
+
+
+def load_actions(client, dataset, keys):
+    load_operations(client, dataset, keys)
+    load_operation_sets(client, dataset, keys)
+    load_accesses(client, dataset, keys)
+
+
+def get_permission_rows(permissions, keys):
+    # Expands each permission into its (subject, access) pairs, skipping any pair already permitted.
+
+    subject_keys = keys['subject']
+    object_keys = keys['object']
+    action_keys = keys['action']
+    access_keys = keys['access']
+    permitted_pairs = set()
+
+    for permission in permissions:
+        for subject_uuid in permission['subject']:
+            if subject_uuid not in subject_keys:
+                continue
+
+            for object_uuid in permission['object']:
+                if object_uuid not in object_keys:
+                    continue
+
+                for action_uuid in permission['action']:
+                    if action_uuid not in action_keys:
+                        continue
+
+                    pair = (subject_keys[subject_uuid], access_keys[(object_keys[object_uuid], action_keys[action_uuid])])
+
+                    if pair not in permitted_pairs:
+                        permitted_pairs.add(pair)
+                        yield pair[0], pair[1], None, True
+
+
+def load_permissions(client, dataset, keys):
+    permissions = dataset['permission']
+    io_controller.out_info('Loading', len(permissions), 'permissions.')
+    db_controller.copy_rows(client, 'permission', ['permitted_subject', 'permitted_access', 'review_date', 'validity'], get_permission_rows(permissions, keys))
+
+
+def load_data(client, dataset):
+    # All tables are loaded by COPY in a single transaction, with keys assigned in memory.
+    # The serial sequences are then moved past the loaded keys so later inserts do not collide with them.
+
+    keys = create_keys()
+
+    with client.xact():
+        load_subjects(client, dataset, keys)
+        load_objects(client, dataset, keys)
+        load_actions(client, dataset, keys)
+        load_permissions(client, dataset, keys)
+
+        for table in ('subject', 'object', 'actions', 'access'):
+            db_controller.reset_sequence(client, table)
@@ -1,4 +1,6 @@
 import os
+from collections import OrderedDict
+from contextlib import contextmanager
 import postgresql
 from postgresql.exceptions import ClientCannotConnectError
 import src.io_controller as io_controller
@@ -6,11 +8,15 @@ from src.io_controller import ProgressBar
 import src.postgres_iam.db_utilities as db_utilities
 
 
+@contextmanager
 def client():
+    # The statements prepared on a connection are closed and removed from the statement cache when the connection is
+    # closed, so that neither is kept alive by the cache.
+
     database = db_utilities.get_database_name()
 
     try:
-        return postgresql.open(database=database)
+        connection = postgresql.open(database=database)
     except ClientCannotConnectError:
         io_controller.out_fatal('Could not establish connection to database.')
         io_controller.out_fatal('Server is not running, database does not exist, or client is improperly configured.')
@@ -18,13 +24,58 @@ def client():
         io_controller.out_fatal('Check configuration at:', os.getcwd() + '/config.ini')
         io_controller.kill()
 
+    with connection:
+        try:
+            yield connection
+        finally:
+            clear_statement_cache(connection)
+
+
+statement_cache_size = 128
+statement_caches = dict()
+
+
+def prepare(client, query):
+    # Returns a prepared statement for a query, reusing one already prepared on the same client where possible.
+    # Each client keeps a least-recently-used cache of up to statement_cache_size statements, keyed by query text.
+
+    try:
+        cached_client, cache = statement_caches[id(client)]
+
+        if cached_client is not client:
+            raise KeyError
+    except KeyError:
+        cache = OrderedDict()
+        statement_caches[id(client)] = (client, cache)
+
+    try:
+        prepared_query = cache.pop(query)
+    except KeyError:
+        prepared_query = client.prepare(query)
+
+        while len(cache) >= statement_cache_size:
+            cache.popitem(last=False)[1].close()
+
+    cache[query] = prepared_query
+    return prepared_query
+
+
+def clear_statement_cache(client):
+    try:
+        cached_client, cache = statement_caches.pop(id(client))
+    except KeyError:
+        return
+
+    for prepared_query in cache.values():
+        prepared_query.close()
+
 
 def execute(client, queries, display_progress=False):
     results = list()
 
     with ProgressBar(len(queries), display=display_progress) as progress_bar:
         for query in queries:
-            prepared_query = client.prepare(query)
+            prepared_query = prepare(client, query)
             result = prepared_query()
             results.append(result)
             progress_bar.increment()
@@ -32,6 +83,35 @@ def execute(client, queries, display_progress=False):
     return results
 
 
+def execute_parameterised(client, query, parameters=()):
+    # Executes a query with $1, $2, ... placeholders bound to the given parameters, rather than formatted into the text.
+
+    prepared_query = prepare(client, query)
+    return prepared_query(*parameters)
+
+
+def execute_many(client, query, parameter_rows):
+    # Executes one prepared query once for each tuple of parameters in an iterable, without collecting results.
+
+    prepared_query = prepare(client, query)
+    prepared_query.load_rows(parameter_rows)
+
+
+def copy_rows(client, table, columns, rows):
+    # Bulk loads an iterable of row tuples into a table with a single COPY ... FROM STDIN statement.
+
+    query = 'COPY %s (%s) FROM STDIN;' % (db_utilities.quote_identifier(table), ', '.join(db_utilities.quote_identifier(column) for column in columns))
+    prepared_query = prepare(client, query)
+    prepared_query.load_rows(db_utilities.format_copy_line(row) for row in rows)
+
+
+def reset_sequence(client, table, column='id'):
+    # Moves the serial sequence of a column past the highest key in use, after keys have been loaded explicitly.
+
+    query = "SELECT setval(pg_get_serial_sequence($1, $2), max(%s)) FROM %s;" % (db_utilities.quote_identifier(column), db_utilities.quote_identifier(table))
+    execute_parameterised(client, query, (table, column))
+
+
 def get_tables(client):
     query = ' '.join([
         "SELECT tablename",
@@ -44,6 +124,25 @@ def get_tables(client):
     return list(result[0] for result in results)
 
 
+def get_materialized_views(client):
+    query = ' '.join([
+        "SELECT matviewname",
+        "FROM pg_catalog.pg_matviews",
+        "WHERE schemaname = 'public';"
+    ])
+
+    queries = [query]
+    results = execute(client, queries)[0]
+    return list(result[0] for result in results)
+
+
+def refresh_views(client):
+    # Materialized views are defined without data, so they must be refreshed after each load before they can be queried.
+
+    queries = list("REFRESH MATERIALIZED VIEW %s;" % db_utilities.quote_identifier(view) for view in get_materialized_views(client))
+    execute(client, queries)
+
+
 def schema_exists(client):
     return len(get_tables(client)) != 0
 
@@ -59,7 +158,7 @@ def drop_table(client, table, verify=False, cascade=True):
     else:
         arg_cascade = ''
 
-    query = "DROP TABLE %s %s %s;" % (arg_verify, table, arg_cascade)
+    query = "DROP TABLE %s %s %s;" % (arg_verify, db_utilities.quote_identifier(table), arg_cascade)
     queries = [query]
     execute(client, queries)
 
@@ -74,7 +173,7 @@ def count_records(client):
     queries = list()
 
     for table in tables:
-        query = "SELECT COUNT(*) FROM %s;" % table
+        query = "SELECT COUNT(*) FROM %s;" % db_utilities.quote_identifier(table)
         queries.append(query)
 
     results = execute(client, queries)
@@ -91,7 +190,7 @@ def clear_table(client, table, cascade=True):
     else:
         arg_cascade = ''
 
-    query = "DELETE FROM %s %s;" % (table, arg_cascade)
+    query = "DELETE FROM %s %s;" % (db_utilities.quote_identifier(table), arg_cascade)
     queries = [query]
     execute(client, queries)
 
@@ -1,6 +1,9 @@
 import os
-from postgresql.exceptions import ClientCannotConnectError
+from contextlib import ExitStack
+from postgresql.exceptions import ClientCannotConnectError, Error as PostgresError
 import src.io_controller as io_controller
+import src.benchmark as benchmark
+import src.data_generation as data_generation
 import src.postgres_iam.db_utilities as db_utilities
 import src.postgres_iam.db_controller as db_controller
 import src.postgres_iam.data_loaders as data_loaders
@@ -19,13 +22,13 @@ def ensure_server_connection(client):
         io_controller.kill()
 
 
-def define_schema(client):
+def define_schema(client, force=False):
     database = db_utilities.get_database_name()
 
     if db_controller.schema_exists(client):
         io_controller.out_warn('Schema already defined for database:', database)
 
-        if io_controller.in_input('Continue with schema definition? (Y/N)').lower() != 'y':
+        if not force and io_controller.in_input('Continue with schema definition? (Y/N)').lower() != 'y':
             io_controller.out_info('Schema definition aborted.')
             return False
 
@@ -36,22 +39,67 @@ def define_schema(client):
     return True
 
 
-def load_data(client):
+def load_data(client, dataset_name=None, force=False):
     database = db_utilities.get_database_name()
 
     if db_controller.data_exists(client):
         io_controller.out_warn('Data already exists in database:', database)
 
-        if io_controller.in_input('Continue with data loading? (Y/N)').lower() != 'y':
+        if not force and io_controller.in_input('Continue with data loading? (Y/N)').lower() != 'y':
             io_controller.out_info('Data loading aborted.')
             return False
 
-    data_loaders.load_data(client)
+    try:
+        dataset = data_generation.Dataset(dataset_name)
+    except FileNotFoundError:
+        io_controller.out_info('Data loading aborted.')
+        return False
+
+    data_loaders.load_data(client, dataset)
+    io_controller.out_info('Refreshing materialized views.')
+    db_controller.refresh_views(client)
     io_controller.out_info('Data loaded for database:', database)
     return True
 
 
-def rebuild_database(client):
-    define_schema(client)
-    load_data(client)
+def rebuild_database(client, dataset_name=None, force=False):
+    define_schema(client, force=force)
+    load_data(client, dataset_name=dataset_name, force=force)
     return True
+
+
+def run_test_queries(client):
+    test_queries = db_utilities.get_named_queries('test_queries')
+
+    for query_name in test_queries:
+        io_controller.out_info('Running test query:', query_name)
+
+        try:
+            results = db_controller.execute(client, test_queries[query_name])
+        except PostgresError as exception:
+            io_controller.out_exception(exception)
+            continue
+
+        result = results[-1]
+
+        if len(result) == 0:
+            io_controller.out_info('Returned 0 results.')
+        else:
+            io_controller.out_info('Returned', len(result), 'results:')
+
+            for row in result:
+                io_controller.out_info(tuple(row))
+
+
+def run_test_query(connection, queries):
+    return len(db_controller.execute(connection, queries)[-1])
+
+
+def benchmark_test_queries(client, params):
+    # Each concurrent query stream is given its own connection, as a connection can only run one query at a time.
+
+    test_queries = db_utilities.get_named_queries('test_queries')
+
+    with ExitStack() as stack:
+        connections = list(stack.enter_context(db_controller.client()) for _ in range(params['concurrency']))
+        return benchmark.benchmark_queries(run_test_query, connections, test_queries, params)
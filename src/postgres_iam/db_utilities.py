@@ -18,7 +18,9 @@ def get_database_name():
 
 
 def unpack_queries(query_string):
-    return list(query + ';' for query in query_string.split(';\n'))
+    # Statements are separated by a semicolon at the end of a line, and the final statement may or may not end with one.
+
+    return list(query.strip().rstrip(';') + ';' for query in query_string.split(';\n') if query.strip().rstrip(';') != '')
 
 
 def get_saved_query(query_name, query_section):
@@ -51,3 +53,28 @@ def get_saved_queries(query_section):
         queries += unpack_queries(query_string)
 
     return queries
+
+
+def get_named_queries(query_section):
+    return {query_name: unpack_queries(get_saved_query(query_name, query_section)) for query_name in utilities.get_config_params('postgres_config.ini', query_section)}
+
+
+def quote_identifier(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def format_copy_value(value):
+    if value is None:
+        return '\\N'
+    elif value is True:
+        return 't'
+    elif value is False:
+        return 'f'
+    else:
+        return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def format_copy_line(row):
+    # Formats a row of values as a line of COPY text format data.
+
+    return ('\t'.join(format_copy_value(value) for value in row) + '\n').encode('utf-8')
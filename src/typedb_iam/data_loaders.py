@@ -1,37 +1,72 @@
 import src.io_controller as io_controller
 import src.typedb_iam.db_controller as db_controller
-import src.data_generation as data_generation
+import src.typedb_iam.db_utilities as db_utilities
 
 
-def load_users(session):
-    data = data_generation.load_data()
-    users = data['user']
-    queries = list()
+def insert_queries(sessions, queries, query_count=None):
+    # Queries are consumed lazily by the insert engine, which commits each batch while later batches are still being
+    # built. At most two batches per session are held in memory at once.
 
+    batch_size = db_utilities.get_batch_size()
+    batch_bytes = db_utilities.get_batch_bytes()
+    db_controller.parallel_insert(sessions, queries, display_progress=True, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def index_items(items):
+    return {item['uuid']: item for item in items}
+
+
+def get_referenced_items(uuids, items):
+    # Resolves a list of uuids against a uuid-indexed dictionary of items, skipping duplicates and unknown uuids.
+
+    return list(items[uuid] for uuid in dict.fromkeys(uuids) if uuid in items)
+
+
+def count_referenced_items(referencing_items, key, items):
+    return sum(len(get_referenced_items(item[key], items)) for item in referencing_items)
+
+
+def get_identifier_type(subject):
+    if 'user_account' in subject['type']:
+        return 'email'
+    else:
+        return 'name'
+
+
+def get_accessible_object_type(obj, action):
+    # Returns the first type of an object that an action is valid for, or None if there is no such type.
+
+    for object_type in obj['type']:
+        if object_type in action['object_type']:
+            return object_type
+
+    return None
+
+
+def count_access_queries(actions, objects):
+    return sum(1 for action in actions for obj in objects if get_accessible_object_type(obj, action) is not None)
+
+
+def generate_user_queries(users):
     for user in users:
         name = user['name']
         email = user['email']
         query = 'insert $p isa person, has name "' + name + '", has email "' + email + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(users), 'users:')
-    db_controller.insert(session, queries, display_progress=True)
 
+def load_users(sessions, dataset):
+    # Users are streamed from disk rather than cached, as this stage only needs a single pass over them.
 
-def load_user_groups(session):
-    data = data_generation.load_data()
-    users = data['user']
-    user_groups = data['user_group']
-    subjects = users + user_groups
-    group_membership_count = 0
-    group_ownership_count = 0
-    queries = list()
+    user_count = dataset.count('user')
+    io_controller.out_info('Loading', user_count, 'users:')
+    insert_queries(sessions, generate_user_queries(dataset.stream('user')), query_count=user_count)
 
+
+def generate_user_group_queries(user_groups):
     for group in user_groups:
         name = group['name']
         group_types = group['type']
-        group_membership_count += len(group['member'])
-        group_ownership_count += len(group['owner'])
 
         if 'business_unit' in group_types:
             group_type = 'business-unit'
@@ -47,220 +82,184 @@ def load_user_groups(session):
             io_controller.kill()
 
         query = 'insert $g isa ' + group_type + ', has ' + identifier_type + ' "' + name + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(user_groups), 'user groups:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_group_membership_queries(user_groups, subjects):
     for group in user_groups:
         group_name = group['name']
+        group_identifier = get_identifier_type(group)
 
-        if 'user_account' in group['type']:
-            group_identifier = 'email'
-        else:
-            group_identifier = 'name'
-
-        for subject in subjects:
-            if subject['uuid'] in group['member']:
-                member_name = subject['name']
-
-                if 'user_account' in subject['type']:
-                    subject_identifier = 'email'
-                else:
-                    subject_identifier = 'name'
+        for subject in get_referenced_items(group['member'], subjects):
+            member_name = subject['name']
+            subject_identifier = get_identifier_type(subject)
 
-                query = ' '.join([
-                    'match',
-                    '$g isa user-group, has ' + group_identifier + ' "' + group_name + '";',
-                    '$s isa subject, has ' + subject_identifier + ' "' + member_name + '";',
-                    'insert',
-                    '$m (user-group: $g, group-member: $s) isa group-membership;'
-                ])
+            query = ' '.join([
+                'match',
+                '$g isa user-group, has ' + group_identifier + ' "' + group_name + '";',
+                '$s isa subject, has ' + subject_identifier + ' "' + member_name + '";',
+                'insert',
+                '$m (user-group: $g, group-member: $s) isa group-membership;'
+            ])
 
-                queries.append(query)
+            yield query
 
-    io_controller.out_info('Loading', group_membership_count, 'group memberships:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_group_ownership_queries(user_groups, subjects):
     for group in user_groups:
         group_name = group['name']
+        group_identifier = get_identifier_type(group)
 
-        if 'user_account' in group['type']:
-            group_identifier = 'email'
-        else:
-            group_identifier = 'name'
-
+        for subject in get_referenced_items(group['owner'], subjects):
+            owner_name = subject['name']
+            owner_identifier = get_identifier_type(subject)
 
-        for subject in subjects:
-            if subject['uuid'] in group['owner']:
-                owner_name = subject['name']
+            query = ' '.join([
+                'match',
+                '$g isa user-group, has ' + group_identifier + ' "' + group_name + '";',
+                '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
+                'insert',
+                '$o (owned-group: $g, group-owner: $s) isa group-ownership;'
+            ])
 
-                if 'user_account' in subject['type']:
-                    owner_identifier = 'email'
-                else:
-                    owner_identifier = 'name'
+            yield query
 
-                query = ' '.join([
-                    'match',
-                    '$g isa user-group, has ' + group_identifier + ' "' + group_name + '";',
-                    '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
-                    'insert',
-                    '$o (owned-group: $g, group-owner: $s) isa group-ownership;'
-                ])
-
-                queries.append(query)
 
+def load_user_groups(sessions, dataset):
+    user_groups = dataset['user_group']
+    subjects = index_items(dataset['user'] + user_groups)
+    io_controller.out_info('Loading', len(user_groups), 'user groups:')
+    insert_queries(sessions, generate_user_group_queries(user_groups), query_count=len(user_groups))
+    group_membership_count = count_referenced_items(user_groups, 'member', subjects)
+    io_controller.out_info('Loading', group_membership_count, 'group memberships:')
+    insert_queries(sessions, generate_group_membership_queries(user_groups, subjects), query_count=group_membership_count)
+    group_ownership_count = count_referenced_items(user_groups, 'owner', subjects)
     io_controller.out_info('Loading', group_ownership_count, 'group ownerships:')
-    db_controller.insert(session, queries, display_progress=True)
-
+    insert_queries(sessions, generate_group_ownership_queries(user_groups, subjects), query_count=group_ownership_count)
 
-def load_subjects(session):
-    load_users(session)
-    load_user_groups(session)
 
+def load_subjects(sessions, dataset):
+    load_users(sessions, dataset)
+    load_user_groups(sessions, dataset)
 
-def load_resources(session):
-    data = data_generation.load_data()
-    resources = data['resource']
-    subjects = data['user'] + data['user_group']
-    resource_ownership_count = 0
-    queries = list()
 
+def generate_resource_queries(resources):
     for resource in resources:
         name = resource['name']
-        resource_ownership_count += len(resource['owner'])
         query = 'insert $f isa file, has filepath "' + name + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(resources), 'resources:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_resource_ownership_queries(resources, subjects):
     for resource in resources:
         resource_name = resource['name']
 
-        for subject in subjects:
-            if subject['uuid'] in resource['owner']:
-                owner_name = subject['name']
+        for subject in get_referenced_items(resource['owner'], subjects):
+            owner_name = subject['name']
+            owner_identifier = get_identifier_type(subject)
 
-                if 'user_account' in subject['type']:
-                    owner_identifier = 'email'
-                else:
-                    owner_identifier = 'name'
+            query = ' '.join([
+                'match',
+                '$r isa resource, has filepath "' + resource_name + '";',
+                '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
+                'insert',
+                '$o (owned-object: $r, object-owner: $s) isa object-ownership;'
+            ])
 
-                query = ' '.join([
-                    'match',
-                    '$r isa resource, has filepath "' + resource_name + '";',
-                    '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
-                    'insert',
-                    '$o (owned-object: $r, object-owner: $s) isa object-ownership;'
-                ])
+            yield query
 
-                queries.append(query)
 
-    io_controller.out_info('Loading', resource_ownership_count, 'resource ownerships:')
-    db_controller.insert(session, queries, display_progress=True)
+def load_resources(sessions, dataset):
+    # Resources are streamed from disk for each pass rather than cached, as they are not looked up by this stage.
 
+    resource_count = dataset.count('resource')
+    subjects = index_items(dataset['user'] + dataset['user_group'])
+    io_controller.out_info('Loading', resource_count, 'resources:')
+    insert_queries(sessions, generate_resource_queries(dataset.stream('resource')), query_count=resource_count)
+    resource_ownership_count = count_referenced_items(dataset.stream('resource'), 'owner', subjects)
+    io_controller.out_info('Loading', resource_ownership_count, 'resource ownerships:')
+    insert_queries(sessions, generate_resource_ownership_queries(dataset.stream('resource'), subjects), query_count=resource_ownership_count)
 
-def load_resource_collections(session):
-    data = data_generation.load_data()
-    resources = data['resource']
-    resource_collections = data['resource_collection']
-    objects = resources + resource_collections
-    subjects = data['user'] + data['user_group']
-    collection_membership_count = 0
-    collection_ownership_count = 0
-    queries = list()
 
+def generate_resource_collection_queries(resource_collections):
     for collection in resource_collections:
         name = collection['name']
-        collection_membership_count += len(collection['member'])
-        collection_ownership_count += len(collection['owner'])
         query = 'insert $d isa directory, has filepath "' + name + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(resource_collections), 'resource collections:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_collection_membership_queries(resource_collections, objects):
     for collection in resource_collections:
         collection_name = collection['name']
 
-        for obj in objects:
-            if obj['uuid'] in collection['member']:
-                member_name = obj['name']
+        for obj in get_referenced_items(collection['member'], objects):
+            member_name = obj['name']
 
-                query = ' '.join([
-                    'match',
-                    '$c isa resource-collection, has filepath "' + collection_name + '";',
-                    '$o isa object, has filepath "' + member_name + '";',
-                    'insert',
-                    '$m (resource-collection: $c, collection-member: $o) isa collection-membership;'
-                ])
+            query = ' '.join([
+                'match',
+                '$c isa resource-collection, has filepath "' + collection_name + '";',
+                '$o isa object, has filepath "' + member_name + '";',
+                'insert',
+                '$m (resource-collection: $c, collection-member: $o) isa collection-membership;'
+            ])
 
-                queries.append(query)
+            yield query
 
-    io_controller.out_info('Loading', collection_membership_count, 'collection memberships:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_collection_ownership_queries(resource_collections, subjects):
     for collection in resource_collections:
         collection_name = collection['name']
 
-        for subject in subjects:
-            if subject['uuid'] in collection['owner']:
-                owner_name = subject['name']
+        for subject in get_referenced_items(collection['owner'], subjects):
+            owner_name = subject['name']
+            owner_identifier = get_identifier_type(subject)
 
-                if 'user_account' in subject['type']:
-                    owner_identifier = 'email'
-                else:
-                    owner_identifier = 'name'
+            query = ' '.join([
+                'match',
+                '$c isa resource-collection, has filepath "' + collection_name + '";',
+                '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
+                'insert',
+                '$o (owned-object: $c, object-owner: $s) isa object-ownership;'
+            ])
 
-                query = ' '.join([
-                    'match',
-                    '$c isa resource-collection, has filepath "' + collection_name + '";',
-                    '$s isa subject, has ' + owner_identifier + ' "' + owner_name + '";',
-                    'insert',
-                    '$o (owned-object: $c, object-owner: $s) isa object-ownership;'
-                ])
+            yield query
 
-                queries.append(query)
 
+def load_resource_collections(sessions, dataset):
+    resource_collections = dataset['resource_collection']
+    objects = index_items(dataset['resource'] + resource_collections)
+    subjects = index_items(dataset['user'] + dataset['user_group'])
+    io_controller.out_info('Loading', len(resource_collections), 'resource collections:')
+    insert_queries(sessions, generate_resource_collection_queries(resource_collections), query_count=len(resource_collections))
+    collection_membership_count = count_referenced_items(resource_collections, 'member', objects)
+    io_controller.out_info('Loading', collection_membership_count, 'collection memberships:')
+    insert_queries(sessions, generate_collection_membership_queries(resource_collections, objects), query_count=collection_membership_count)
+    collection_ownership_count = count_referenced_items(resource_collections, 'owner', subjects)
     io_controller.out_info('Loading', collection_ownership_count, 'collection ownerships:')
-    db_controller.insert(session, queries, display_progress=True)
-
+    insert_queries(sessions, generate_collection_ownership_queries(resource_collections, subjects), query_count=collection_ownership_count)
 
-def load_objects(session):
-    load_resources(session)
-    load_resource_collections(session)
 
+def load_objects(sessions, dataset):
+    load_resources(sessions, dataset)
+    load_resource_collections(sessions, dataset)
 
-def load_operations(session):
-    data = data_generation.load_data()
-    operations = data['operation']
-    objects = data['resource'] + data['resource_collection']
-    queries = list()
 
+def generate_operation_queries(operations):
     for operation in operations:
         name = operation['name']
         query = 'insert $o isa operation, has name "' + name + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(operations), 'operations:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_operation_access_queries(operations, objects):
     for operation in operations:
         operation_name = operation['name']
 
         for obj in objects:
-            object_types = list(object_type for object_type in obj['type'] if object_type in operation['object_type'])
+            object_type = get_accessible_object_type(obj, operation)
 
-            if len(object_types) != 0:
+            if object_type is not None:
                 object_name = obj['name']
-                object_type = object_types[0]
 
                 query = ' '.join([
                     'match',
@@ -270,61 +269,55 @@ def load_operations(session):
                     '$a (accessed-object: $ob, valid-action: $op) isa access;'
                 ])
 
-                queries.append(query)
+                yield query
+
 
-    io_controller.out_info('Loading up to', len(operations) * len(objects), 'potential accesses:')
-    db_controller.insert(session, queries, display_progress=True)
+def load_operations(sessions, dataset):
+    # Operations are streamed from disk for each pass rather than cached, as they are not looked up by this stage.
 
+    operation_count = dataset.count('operation')
+    objects = dataset['resource'] + dataset['resource_collection']
+    io_controller.out_info('Loading', operation_count, 'operations:')
+    insert_queries(sessions, generate_operation_queries(dataset.stream('operation')), query_count=operation_count)
+    access_count = count_access_queries(dataset.stream('operation'), objects)
+    io_controller.out_info('Loading', access_count, 'accesses:')
+    insert_queries(sessions, generate_operation_access_queries(dataset.stream('operation'), objects), query_count=access_count)
 
-def load_operation_sets(session):
-    data = data_generation.load_data()
-    operations = data['operation']
-    operation_sets = data['operation_set']
-    actions = operations + operation_sets
-    objects = data['resource'] + data['resource_collection']
-    set_membership_count = 0
-    queries = list()
 
+def generate_operation_set_queries(operation_sets):
     for opset in operation_sets:
         name = opset['name']
-        set_membership_count += len(opset['member'])
         query = 'insert $s isa operation-set, has name "' + name + '";'
-        queries.append(query)
+        yield query
 
-    io_controller.out_info('Loading', len(operation_sets), 'operation sets:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_set_membership_queries(operation_sets, actions):
     for opset in operation_sets:
         set_name = opset['name']
 
-        for action in actions:
-            if action['uuid'] in opset['member']:
-                member_name = action['name']
+        for action in get_referenced_items(opset['member'], actions):
+            member_name = action['name']
 
-                query = ' '.join([
-                    'match',
-                    '$s isa operation-set, has name "' + set_name + '";',
-                    '$a isa action, has name "' + member_name + '";',
-                    'insert'
-                    '$m (operation-set: $s, set-member: $a) isa set-membership;'
-                ])
+            query = ' '.join([
+                'match',
+                '$s isa operation-set, has name "' + set_name + '";',
+                '$a isa action, has name "' + member_name + '";',
+                'insert',
+                '$m (operation-set: $s, set-member: $a) isa set-membership;'
+            ])
 
-                queries.append(query)
+            yield query
 
-    io_controller.out_info('Loading', set_membership_count, 'set memberships:')
-    db_controller.insert(session, queries, display_progress=True)
-    queries = list()
 
+def generate_operation_set_access_queries(operation_sets, objects):
     for opset in operation_sets:
         set_name = opset['name']
 
         for obj in objects:
-            object_types = list(object_type for object_type in obj['type'] if object_type in opset['object_type'])
+            object_type = get_accessible_object_type(obj, opset)
 
-            if len(object_types) != 0:
+            if object_type is not None:
                 object_name = obj['name']
-                object_type = object_types[0]
 
                 query = ' '.join([
                     'match',
@@ -334,62 +327,143 @@ def load_operation_sets(session):
                     '$a (accessed-object: $o, valid-action: $s) isa access;'
                 ])
 
-                queries.append(query)
+                yield query
+
+
+def load_operation_sets(sessions, dataset):
+    operation_sets = dataset['operation_set']
+    actions = index_items(dataset['operation'] + operation_sets)
+    objects = dataset['resource'] + dataset['resource_collection']
+    io_controller.out_info('Loading', len(operation_sets), 'operation sets:')
+    insert_queries(sessions, generate_operation_set_queries(operation_sets), query_count=len(operation_sets))
+    set_membership_count = count_referenced_items(operation_sets, 'member', actions)
+    io_controller.out_info('Loading', set_membership_count, 'set memberships:')
+    insert_queries(sessions, generate_set_membership_queries(operation_sets, actions), query_count=set_membership_count)
+    access_count = count_access_queries(operation_sets, objects)
+    io_controller.out_info('Loading', access_count, 'accesses:')
+    insert_queries(sessions, generate_operation_set_access_queries(operation_sets, objects), query_count=access_count)
+
+
+def load_actions(sessions, dataset):
+    load_operations(sessions, dataset)
+    load_operation_sets(sessions, dataset)
 
-    io_controller.out_info('Loading up to', len(operation_sets) * len(objects), 'potential accesses:')
-    db_controller.insert(session, queries, display_progress=True)
 
+def get_permitted_items(permission, subjects, objects, actions):
+    # Resolves the subjects, objects and actions of a permission using uuid-indexed dictionaries of each.
 
-def load_actions(session):
-    load_operations(session)
-    load_operation_sets(session)
+    permitted_subjects = get_referenced_items(permission['subject'], subjects)
+    permitted_objects = get_referenced_items(permission['object'], objects)
+    permitted_actions = get_referenced_items(permission['action'], actions)
+    return permitted_subjects, permitted_objects, permitted_actions
 
 
-def load_permissions(session):
-    data = data_generation.load_data()
-    permissions = data['permission']
-    subjects = data['user'] + data['user_group']
-    objects = data['resource'] + data['resource_collection']
-    actions = data['operation'] + data['operation_set']
-    queries = list()
+def count_permission_queries(permissions, subjects, objects, actions):
+    query_count = 0
+
+    for permission in permissions:
+        permitted_subjects, permitted_objects, permitted_actions = get_permitted_items(permission, subjects, objects, actions)
+        query_count += len(permitted_subjects) * len(permitted_objects) * len(permitted_actions)
+
+    return query_count
+
+
+def generate_permission_queries(permissions, subjects, objects, actions):
+    # Expands each permission into one query for each of its (subject, object, action) triples.
+    # Queries are yielded one at a time rather than collected, so they can be inserted as they are built.
 
     for permission in permissions:
         subject_type = permission['subject_type']
         object_type = permission['object_type']
+        permitted_subjects, permitted_objects, permitted_actions = get_permitted_items(permission, subjects, objects, actions)
+
+        for subject in permitted_subjects:
+            subject_name = subject['name']
+            identifier_type = get_identifier_type(subject)
 
-        for subject in subjects:
-            if subject['uuid'] in permission['subject']:
-                for obj in objects:
-                    if obj['uuid'] in permission['object']:
-                        for action in actions:
-                            if action['uuid'] in permission['action']:
-                                subject_name = subject['name']
-                                object_name = obj['name']
-                                action_name = action['name']
-
-                                if 'user_account' in subject['type']:
-                                    identifier_type = 'email'
-                                else:
-                                    identifier_type = 'name'
-
-                                query = ' '.join([
-                                    'match',
-                                    '$s isa ' + subject_type.replace('_', '-') + ', has ' + identifier_type + ' "' + subject_name + '";',
-                                    '$o isa ' + object_type.replace('_', '-') + ', has filepath "' + object_name + '";',
-                                    '$a isa action, has name "' + action_name + '";',
-                                    '$ac (accessed-object: $o, valid-action: $a) isa access;',
-                                    'insert',
-                                    '$p (permitted-subject: $s, permitted-access: $ac) isa permission;'
-                                ])
-
-                                queries.append(query)
+            for obj in permitted_objects:
+                object_name = obj['name']
 
+                for action in permitted_actions:
+                    action_name = action['name']
+
+                    query = ' '.join([
+                        'match',
+                        '$s isa ' + subject_type.replace('_', '-') + ', has ' + identifier_type + ' "' + subject_name + '";',
+                        '$o isa ' + object_type.replace('_', '-') + ', has filepath "' + object_name + '";',
+                        '$a isa action, has name "' + action_name + '";',
+                        '$ac (accessed-object: $o, valid-action: $a) isa access;',
+                        'insert',
+                        '$p (permitted-subject: $s, permitted-access: $ac) isa permission;'
+                    ])
+
+                    yield query
+
+
+def load_permissions(sessions, dataset):
+    permissions = dataset['permission']
+    subjects = index_items(dataset['user'] + dataset['user_group'])
+    objects = index_items(dataset['resource'] + dataset['resource_collection'])
+    actions = index_items(dataset['operation'] + dataset['operation_set'])
+    query_count = count_permission_queries(permissions, subjects, objects, actions)
+    queries = generate_permission_queries(permissions, subjects, objects, actions)
     io_controller.out_info('Loading', len(permissions), 'permissions:')
-    db_controller.insert(session, queries, display_progress=True)
+    insert_queries(sessions, queries, query_count=query_count)
+
+
+def load_data(sessions, dataset):
+    # Each loading stage only returns once all of its queries are committed, so entities are always loaded before the
+    # relations that match them, and accesses before the permissions that match those.
+
+    load_subjects(sessions, dataset)
+    load_objects(sessions, dataset)
+    load_actions(sessions, dataset)
+    load_permissions(sessions, dataset)
+
+
+def get_pseudo_items(member_records, items):
+    # Builds copies of existing groups or collections that hold only the members added by a delta, so that the
+    # membership queries of a full load can be reused to insert only the new memberships.
 
+    return list(dict(items[record['uuid']], member=record['member']) for record in member_records if record['uuid'] in items)
 
-def load_data(session):
-    load_subjects(session)
-    load_objects(session)
-    load_actions(session)
-    load_permissions(session)
+
+def load_delta(sessions, dataset, delta):
+    # Applies a single delta to a database that already holds the rest of the dataset.
+    # Items are looked up in the merged dataset, which includes the delta, but only the delta's records are inserted:
+    # new users and resources, their memberships, ownerships and accesses, and the new permissions.
+
+    users = delta['user']
+    resources = delta['resource']
+    permissions = delta['permission']
+    subjects = index_items(dataset['user'] + dataset['user_group'])
+    objects = index_items(dataset['resource'] + dataset['resource_collection'])
+    actions = index_items(dataset['operation'] + dataset['operation_set'])
+    user_groups = get_pseudo_items(delta['user_group_member'], subjects)
+    resource_collections = get_pseudo_items(delta['resource_collection_member'], objects)
+
+    io_controller.out_info('Loading', len(users), 'users:')
+    insert_queries(sessions, generate_user_queries(users), query_count=len(users))
+    group_membership_count = count_referenced_items(user_groups, 'member', subjects)
+    io_controller.out_info('Loading', group_membership_count, 'group memberships:')
+    insert_queries(sessions, generate_group_membership_queries(user_groups, subjects), query_count=group_membership_count)
+
+    io_controller.out_info('Loading', len(resources), 'resources:')
+    insert_queries(sessions, generate_resource_queries(resources), query_count=len(resources))
+    resource_ownership_count = count_referenced_items(resources, 'owner', subjects)
+    io_controller.out_info('Loading', resource_ownership_count, 'resource ownerships:')
+    insert_queries(sessions, generate_resource_ownership_queries(resources, subjects), query_count=resource_ownership_count)
+    collection_membership_count = count_referenced_items(resource_collections, 'member', objects)
+    io_controller.out_info('Loading', collection_membership_count, 'collection memberships:')
+    insert_queries(sessions, generate_collection_membership_queries(resource_collections, objects), query_count=collection_membership_count)
+
+    operation_access_count = count_access_queries(dataset['operation'], resources)
+    io_controller.out_info('Loading', operation_access_count, 'operation accesses:')
+    insert_queries(sessions, generate_operation_access_queries(dataset['operation'], resources), query_count=operation_access_count)
+    operation_set_access_count = count_access_queries(dataset['operation_set'], resources)
+    io_controller.out_info('Loading', operation_set_access_count, 'operation set accesses:')
+    insert_queries(sessions, generate_operation_set_access_queries(dataset['operation_set'], resources), query_count=operation_set_access_count)
+
+    query_count = count_permission_queries(permissions, subjects, objects, actions)
+    io_controller.out_info('Loading', len(permissions), 'permissions:')
+    insert_queries(sessions, generate_permission_queries(permissions, subjects, objects, actions), query_count=query_count)
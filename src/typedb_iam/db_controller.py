@@ -1,4 +1,7 @@
 import math
+import queue
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typedb.client import TypeDB, TransactionType
 from typedb.common.exception import TypeDBClientException
 import src.polynomial as polynomial
@@ -6,6 +9,9 @@ import src.io_controller as io_controller
 from src.io_controller import ProgressBar
 
 
+graph_statistics_cache = dict()
+
+
 def client():
     return TypeDB.core_client(address=TypeDB.DEFAULT_ADDRESS)
 
@@ -19,13 +25,19 @@ def unpack_result(result):
     return output
 
 
-def decode_result(result):
-    output = list()
+def stream_result(result, projection=None):
+    # Lazily decodes each answer as it is read from the answer stream, rather than draining the stream into a list.
+    # If a projection is given, only the listed variables are decoded, and non-attribute concepts are always skipped.
 
     for item in result:
         item_dict = dict()
 
-        for key in item.map():
+        if projection is None:
+            keys = item.map()
+        else:
+            keys = projection
+
+        for key in keys:
             concept = item.get(key)
 
             if not concept.is_attribute():
@@ -33,9 +45,22 @@ def decode_result(result):
 
             item_dict[key] = concept.get_value()
 
-        output.append(item_dict)
+        yield item_dict
+
+
+def decode_result(result):
+    return list(stream_result(result))
 
-    return output
+
+def decode_numeric(result):
+    numeric = result.get()
+
+    if numeric.is_int():
+        return numeric.as_int()
+    elif numeric.is_float():
+        return numeric.as_float()
+    else:
+        return None
 
 
 def get_databases(client):
@@ -43,6 +68,8 @@ def get_databases(client):
 
 
 def create_database(client, database):
+    invalidate_graph_statistics(database)
+
     try:
         return client.databases().create(name=database)
     except TypeDBClientException as exception:
@@ -55,6 +82,8 @@ def database_exists(client, database):
 
 
 def delete_database(client, database):
+    invalidate_graph_statistics(database)
+
     try:
         return client.databases().get(name=database).delete()
     except TypeDBClientException as exception:
@@ -62,129 +91,265 @@ def delete_database(client, database):
         return
 
 
-def define(session, queries, display_progress=False):
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
-                transaction.query().define(query=query)
-                transaction.commit()
+def split_batches(queries, batch_size=1, batch_bytes=None):
+    # Splits a list of queries into consecutive batches to be committed in a single transaction each.
+    # A batch is closed when it holds batch_size queries, or when adding the next query would take its total size in
+    # UTF-8 encoded bytes over batch_bytes. A single query larger than batch_bytes is placed in a batch of its own.
 
-            progress_bar.increment()
+    batch = list()
+    batch_bytes_used = 0
 
+    for query in queries:
+        query_bytes = len(query.encode('utf-8')) if batch_bytes is not None else 0
 
-def undefine(session, queries, display_progress=False):
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
-                transaction.query().undefine(query=query)
-                transaction.commit()
+        if len(batch) != 0:
+            if len(batch) >= batch_size or (batch_bytes is not None and batch_bytes_used + query_bytes > batch_bytes):
+                yield batch
+                batch = list()
+                batch_bytes_used = 0
 
-            progress_bar.increment()
+        batch.append(query)
+        batch_bytes_used += query_bytes
 
+    if len(batch) != 0:
+        yield batch
 
-def match(session, queries, display_progress=False):
-    results = list()
 
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.READ) as transaction:
-                result = transaction.query().match(query=query)
-                results.append(unpack_result(result))
+def write_batch(session, batch, query_type):
+    # Executes a batch of write queries in a single transaction and commits it.
+    # If the transaction fails, it is rolled back and the batch is retried as two halves, down to single queries.
+    # An exception is only raised if a single query fails on its own.
 
-            progress_bar.increment()
+    try:
+        with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
+            query_function = getattr(transaction.query(), query_type)
 
-    return results
+            for query in batch:
+                query_function(query=query)
 
+            transaction.commit()
 
-def get(session, queries, display_progress=False):
-    results = list()
+        invalidate_graph_statistics(session.database().name())
+    except TypeDBClientException:
+        if len(batch) == 1:
+            raise
 
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.READ) as transaction:
-                result = transaction.query().match(query=query)
-                results.append(decode_result(result))
+        io_controller.out_debug('Failed to commit batch of', len(batch), 'queries. Retrying with smaller batches.')
+        split_index = len(batch) // 2
+        write_batch(session, batch[:split_index], query_type)
+        write_batch(session, batch[split_index:], query_type)
 
-            progress_bar.increment()
 
-    return results
+def write(session, queries, query_type, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    # The queries may be supplied as any iterable, in which case query_count should be given for progress display.
 
+    if query_count is None:
+        query_count = len(queries)
 
-def insert(session, queries, display_progress=False):
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
-                transaction.query().insert(query=query)
-                transaction.commit()
+    with ProgressBar(query_count, display=display_progress) as progress_bar:
+        for batch in split_batches(queries, batch_size=batch_size, batch_bytes=batch_bytes):
+            write_batch(session, batch, query_type)
+            progress_bar.advance(len(batch))
 
-            progress_bar.increment()
 
+def write_pooled_batch(session_pool, batch, query_type):
+    # Borrows a session from the pool for the duration of a batch write, so no two workers share a session.
 
-def update(session, queries, display_progress=False):
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
-                transaction.query().update(query=query)
-                transaction.commit()
+    session = session_pool.get()
 
-            progress_bar.increment()
+    try:
+        write_batch(session, batch, query_type)
+    finally:
+        session_pool.put(session)
 
+    return len(batch)
 
-def delete(session, queries, display_progress=False):
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.WRITE) as transaction:
-                transaction.query().delete(query=query)
-                transaction.commit()
 
-            progress_bar.increment()
+def parallel_write(sessions, queries, query_type, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    # Distributes batches of write queries over a pool of worker threads, one for each session supplied.
+    # At most two batches per worker are queued at any time to bound memory use.
+    # Returns only once every batch has been committed, so successive calls act as barriers between dependent stages.
+    # The queries may be supplied as any iterable, in which case query_count should be given for progress display.
 
+    if query_count is None:
+        query_count = len(queries)
 
-def group(session, queries, display_progress=False):
-    results = list()
+    session_pool = queue.Queue()
 
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.READ) as transaction:
-                result = transaction.query().match_group(query=query)
-                results.append(decode_result(result))
+    for session in sessions:
+        session_pool.put(session)
 
-            progress_bar.increment()
+    with ProgressBar(query_count, display=display_progress) as progress_bar:
+        with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+            pending = set()
 
-    return results
+            for batch in split_batches(queries, batch_size=batch_size, batch_bytes=batch_bytes):
+                if len(pending) >= 2 * len(sessions):
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
 
+                    for future in done:
+                        progress_bar.advance(future.result())
 
-def aggregate(session, queries, display_progress=False):
-    results = list()
+                pending.add(executor.submit(write_pooled_batch, session_pool, batch, query_type))
+
+            for future in wait(pending).done:
+                progress_bar.advance(future.result())
+
+
+def define(session, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    write(session, queries, 'define', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def undefine(session, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    write(session, queries, 'undefine', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
 
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.READ) as transaction:
-                result = transaction.query().match_aggregate(query=query)
-                results.append(decode_result(result))
 
+def read_queue(session, query_queue, query_type, decode_function, results, progress_bar):
+    # Runs queries taken from a shared queue until it is empty, storing each decoded result at the index of its query.
+    # A single READ transaction is reused for every query taken by the worker, as reads cannot change what later reads see.
+
+    with session.transaction(transaction_type=TransactionType.READ) as transaction:
+        while True:
+            try:
+                i, query = query_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            result = getattr(transaction.query(), query_type)(query=query)
+            results[i] = decode_function(result)
             progress_bar.increment()
 
+
+def parallel_read(sessions, queries, query_type, decode_function, display_progress=False):
+    # Runs independent read queries over a pool of sessions, with one worker and one transaction per session.
+    # Workers take the next query from a shared queue as they finish the last, so slow queries do not hold up the others.
+    # Results are returned in the same order as the queries.
+
+    query_queue = queue.Queue()
+
+    for i, query in enumerate(queries):
+        query_queue.put((i, query))
+
+    results = [None] * query_queue.qsize()
+    workers = min(len(sessions), len(results))
+
+    with ProgressBar(len(results), display=display_progress) as progress_bar:
+        if workers == 1:
+            read_queue(sessions[0], query_queue, query_type, decode_function, results, progress_bar)
+        elif workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = list(executor.submit(read_queue, session, query_queue, query_type, decode_function, results, progress_bar) for session in sessions[:workers])
+
+                for future in futures:
+                    future.result()
+
     return results
 
 
+def read(session, queries, query_type, decode_function, display_progress=False):
+    return parallel_read([session], queries, query_type, decode_function, display_progress=display_progress)
+
+
+def stream(session, query, projection=None):
+    # Yields decoded answers to a single query one at a time, keeping its READ transaction open until the answers are exhausted.
+    # The transaction is also closed if the caller stops iterating early and the generator is closed or garbage collected.
+
+    with session.transaction(transaction_type=TransactionType.READ) as transaction:
+        result = transaction.query().match(query=query)
+
+        for item_dict in stream_result(result, projection=projection):
+            yield item_dict
+
+
+def decode_numerics(result):
+    output = list()
+
+    for item in result:
+        output.append(item.numeric().as_int())
+
+    return output
+
+
+def decode_histogram(result):
+    # Counts the occurrences of each value in a grouped aggregate, without keeping the values for each group.
+
+    histogram = dict()
+
+    for item in result:
+        value = item.numeric().as_int()
+        histogram[value] = histogram.get(value, 0) + 1
+
+    return histogram
+
+
+def decode_labels(result):
+    return list(str(item.get('t').get_label()) for item in result)
+
+
+def match(session, queries, display_progress=False):
+    return read(session, queries, 'match', unpack_result, display_progress=display_progress)
+
+
+def parallel_match(sessions, queries, display_progress=False):
+    return parallel_read(sessions, queries, 'match', unpack_result, display_progress=display_progress)
+
+
+def get(session, queries, display_progress=False):
+    return read(session, queries, 'match', decode_result, display_progress=display_progress)
+
+
+def parallel_get(sessions, queries, display_progress=False):
+    return parallel_read(sessions, queries, 'match', decode_result, display_progress=display_progress)
+
+
+def insert(session, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    write(session, queries, 'insert', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def parallel_insert(sessions, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    parallel_write(sessions, queries, 'insert', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def update(session, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    write(session, queries, 'update', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def delete(session, queries, display_progress=False, batch_size=1, batch_bytes=None, query_count=None):
+    write(session, queries, 'delete', display_progress=display_progress, batch_size=batch_size, batch_bytes=batch_bytes, query_count=query_count)
+
+
+def group(session, queries, display_progress=False):
+    return read(session, queries, 'match_group', decode_result, display_progress=display_progress)
+
+
+def parallel_group(sessions, queries, display_progress=False):
+    return parallel_read(sessions, queries, 'match_group', decode_result, display_progress=display_progress)
+
+
+def aggregate(session, queries, display_progress=False):
+    return read(session, queries, 'match_aggregate', decode_numeric, display_progress=display_progress)
+
+
+def parallel_aggregate(sessions, queries, display_progress=False):
+    return parallel_read(sessions, queries, 'match_aggregate', decode_numeric, display_progress=display_progress)
+
+
 def group_aggregate(session, queries, display_progress=False):
-    results = list()
+    return read(session, queries, 'match_group_aggregate', decode_numerics, display_progress=display_progress)
 
-    with ProgressBar(len(queries), display=display_progress) as progress_bar:
-        for query in queries:
-            with session.transaction(transaction_type=TransactionType.READ) as transaction:
-                result = transaction.query().match_group_aggregate(query=query)
-                output = list()
 
-                for item in result:
-                    output.append(item.numeric().as_int())
+def parallel_group_aggregate(sessions, queries, display_progress=False):
+    return parallel_read(sessions, queries, 'match_group_aggregate', decode_numerics, display_progress=display_progress)
 
-                results.append(output)
 
-            progress_bar.increment()
+def count(session, pattern):
+    # Counts the answers to a match pattern on the server, so that only the total is sent to the client.
 
-    return results
+    queries = [
+        'match ' + pattern + ' count;'
+    ]
+
+    return aggregate(session, queries)[0]
 
 
 def count_types(session, supertype='thing'):
@@ -195,44 +360,25 @@ def count_types(session, supertype='thing'):
     else:
         modifier = 0
 
-    queries = [
-        'match $t sub ' + supertype + ';'
-    ]
-
     try:
-        results = match(session, queries)
+        type_count = count(session, '$t sub ' + supertype + ';')
     except TypeDBClientException as exception:
         io_controller.out_exception(exception)
         return
 
-    return len(list(results[0])) + modifier
+    return type_count + modifier
 
 
 def count_things(session, thing_type='thing'):
-    queries = [
-        'match $t isa ' + thing_type + ';'
-    ]
-
-    results = match(session, queries)
-    return len(list(results[0]))
+    return count(session, '$t isa ' + thing_type + ';')
 
 
 def count_players(session):
-    queries = [
-        'match $r($t);'
-    ]
-
-    results = match(session, queries)
-    return len(list(results[0]))
+    return count(session, '$r($t);')
 
 
 def count_owners(session):
-    queries = [
-        'match $t has $a;'
-    ]
-
-    results = match(session, queries)
-    return len(list(results[0]))
+    return count(session, '$t has $a;')
 
 
 def schema_exists(session):
@@ -240,57 +386,115 @@ def schema_exists(session):
 
 
 def data_exists(session):
-    return count_things(session) != 0
+    # Only the first answer is needed to know that data exists, so the query is limited rather than counted.
 
+    with closing(stream(session, 'match $t isa thing; limit 1;', projection=list())) as answers:
+        return next(answers, None) is not None
 
-def get_barabasi_albert_fit(session):
-    # Determines the goodness-of-fit of the Barabási–Albert model for the database graph.
-    # Returns the graph scale parameter and the coefficient of determination R² for that parameter.
-    # It should be noted that R² is not the best measure of goodness-of-fit for log-log graphs.
 
+def get_concrete_types(session, supertype):
     queries = [
-        ' '.join([
-            'match',
-            '$t isa thing;',
-            '$x isa thing;',
-            '{ $x($t); } or',
-            '{ $t($x); } or',
-            '{ $t has $x; } or',
-            '{ $x has $t; };',
-            'get $t, $x;',
-            'group $t;',
-            'count;'
-        ])
+        'match $t sub ' + supertype + '; not { $t abstract; };'
     ]
 
-    vertex_degrees = group_aggregate(session, queries)[0]
-    histogram = dict()
+    return list(label for label in read(session, queries, 'match', decode_labels)[0] if label != supertype)
+
+
+def get_partitions(session):
+    # Lists the concrete entity, relation and attribute types, which partition every thing by its exact type.
+
+    return {supertype: get_concrete_types(session, supertype) for supertype in ('entity', 'relation', 'attribute')}
+
+
+def merge_histograms(histograms):
+    merged = dict()
+
+    for histogram in histograms:
+        for value in histogram:
+            merged[value] = merged.get(value, 0) + histogram[value]
+
+    return merged
+
 
-    for degree in vertex_degrees:
-        try:
-            histogram[degree] += 1
-        except KeyError:
-            histogram[degree] = 1
+def count_partitioned(sessions, partitions):
+    # Counts vertices and edges with one server-side count per type, run in parallel over the sessions.
+    # Each thing is counted under its exact type with isa!, so that no thing is counted under two types.
+    # Edges are counted as role players per relation type and as owners per attribute type.
 
-    things = count_things(session)
+    thing_types = partitions['entity'] + partitions['relation'] + partitions['attribute']
+    vertex_queries = list('match $t isa! ' + thing_type + '; count;' for thing_type in thing_types)
+    player_queries = list('match $r isa! ' + relation_type + '; $r($t); count;' for relation_type in partitions['relation'])
+    owner_queries = list('match $a isa! ' + attribute_type + '; $t has $a; count;' for attribute_type in partitions['attribute'])
+    results = parallel_aggregate(sessions, vertex_queries + player_queries + owner_queries)
+    vertices = sum(results[:len(vertex_queries)])
+    edges = sum(results[len(vertex_queries):])
+    return vertices, edges
+
+
+def get_degree_histogram(sessions, partitions):
+    # Counts the degree of every vertex with one grouped query per type, run in parallel over the sessions.
+    # Each query is reduced to a histogram of degrees as its answers arrive, and the histograms are then merged,
+    # so the degrees of individual vertices are never held by the client.
+
+    thing_types = partitions['entity'] + partitions['relation'] + partitions['attribute']
+
+    queries = list(' '.join([
+        'match',
+        '$t isa! ' + thing_type + ';',
+        '$x isa thing;',
+        '{ $x($t); } or',
+        '{ $t($x); } or',
+        '{ $t has $x; } or',
+        '{ $x has $t; };',
+        'get $t, $x;',
+        'group $t;',
+        'count;'
+    ]) for thing_type in thing_types)
+
+    return merge_histograms(parallel_read(sessions, queries, 'match_group_aggregate', decode_histogram))
+
+
+def get_barabasi_albert_fit(sessions, partitions=None, things=None):
+    # Determines the goodness-of-fit of the Barabási–Albert model for the database graph.
+    # Returns the graph scale parameter and the coefficient of determination R² for that parameter.
+    # It should be noted that R² is not the best measure of goodness-of-fit for log-log graphs.
+
+    if partitions is None:
+        partitions = get_partitions(sessions[0])
+
+    if things is None:
+        things = count_partitioned(sessions, partitions)[0]
+
+    histogram = get_degree_histogram(sessions, partitions)
     log_k = list(math.log10(k) for k in sorted(histogram))
     log_P = list(math.log10(histogram[k] / things) for k in sorted(histogram))
     poly = polynomial.lin_reg(log_k, log_P)
-    log_f = list(polynomial.poly_point(poly, x) for x in log_k)
+    log_f = polynomial.poly_points(poly, log_k)
     R2 = polynomial.coef_det(log_P, log_f)
     scale_parameter = -poly[1]
     return scale_parameter, R2
 
 
-def get_graph_statistics(session):
+def invalidate_graph_statistics(database):
+    graph_statistics_cache.pop(database, None)
+
+
+def get_graph_statistics(sessions):
     # Approximates statistics for the database by assuming it is a Barabási–Albert graph.
     # DOI: 10.1126/science.286.5439.509
     # DOI: 10.48550/arXiv.cond-mat/0407098
+    # Statistics are cached for each database until data is next written to it or it is recreated by this process.
+
+    database = sessions[0].database().name()
+
+    if database in graph_statistics_cache:
+        io_controller.out_debug('Using cached graph statistics for database:', database)
+        return dict(graph_statistics_cache[database])
 
-    vertices = count_things(session)
-    edges = count_players(session) + count_owners(session)
+    partitions = get_partitions(sessions[0])
+    vertices, edges = count_partitioned(sessions, partitions)
     average_vertex_degree = 2 * edges / vertices
-    scale_parameter, coefficient_of_determination = get_barabasi_albert_fit(session)
+    scale_parameter, coefficient_of_determination = get_barabasi_albert_fit(sessions, partitions=partitions, things=vertices)
     network_age = (vertices + math.sqrt(vertices ** 2 - 4 * edges)) / 2
     growth_factor = (vertices - math.sqrt(vertices ** 2 - 4 * edges)) / 2
     euler_constant = 0.5772156649
@@ -309,4 +513,5 @@ def get_graph_statistics(session):
         'average_path_length': average_path_length
     }
 
-    return statistics
+    graph_statistics_cache[database] = statistics
+    return dict(statistics)
@@ -1,8 +1,11 @@
 import os
+from contextlib import ExitStack
 from typedb.client import SessionType, TypeDBOptions
 from typedb.common.exception import TypeDBClientException
 import src.utilities as utilities
 import src.io_controller as io_controller
+import src.benchmark as benchmark
+import src.data_generation as data_generation
 import src.typedb_iam.db_utilities as db_utilities
 import src.typedb_iam.db_controller as db_controller
 import src.typedb_iam.data_loaders as data_loaders
@@ -20,13 +23,13 @@ def ensure_server_connection(client):
         io_controller.kill()
 
 
-def create_database(client):
+def create_database(client, force=False):
     database = db_utilities.get_database_name()
 
     if db_controller.database_exists(client, database):
         io_controller.out_warn('Existing database with name', database, 'will be deleted.')
 
-        if io_controller.in_input('Continue with database creation? (Y/N)').lower() != 'y':
+        if not force and io_controller.in_input('Continue with database creation? (Y/N)').lower() != 'y':
             io_controller.out_info('Database creation aborted.')
             return False
         else:
@@ -37,14 +40,14 @@ def create_database(client):
     return True
 
 
-def define_schema(client):
+def define_schema(client, force=False):
     database = db_utilities.get_database_name()
 
     with client.session(database=database, session_type=SessionType.SCHEMA) as session:
         if db_controller.schema_exists(session):
             io_controller.out_warn('Schema already defined for database:', database)
 
-            if io_controller.in_input('Continue with schema definition? (Y/N)').lower() != 'y':
+            if not force and io_controller.in_input('Continue with schema definition? (Y/N)').lower() != 'y':
                 io_controller.out_info('Schema definition aborted.')
                 return False
 
@@ -54,45 +57,81 @@ def define_schema(client):
         return True
 
 
-def load_data(client):
+def load_data(client, dataset_name=None, force=False):
     database = db_utilities.get_database_name()
+    workers = db_utilities.get_load_workers()
 
-    with client.session(database=database, session_type=SessionType.DATA) as session:
-        if db_controller.data_exists(session):
+    with ExitStack() as stack:
+        sessions = list(stack.enter_context(client.session(database=database, session_type=SessionType.DATA)) for _ in range(workers))
+
+        if db_controller.data_exists(sessions[0]):
             io_controller.out_warn('Data already exists in database:', database)
 
-            if io_controller.in_input('Continue with data loading? (Y/N)').lower() != 'y':
+            if not force and io_controller.in_input('Continue with data loading? (Y/N)').lower() != 'y':
                 io_controller.out_info('Data loading aborted.')
                 return False
 
-        data_loaders.load_data(session)
+        try:
+            dataset = data_generation.Dataset(dataset_name)
+        except FileNotFoundError:
+            io_controller.out_info('Data loading aborted.')
+            return False
+
+        data_loaders.load_data(sessions, dataset)
         io_controller.out_info('Data loaded for database:', database)
         return True
 
 
-def rebuild_database(client):
-    created = create_database(client)
+def load_delta(client, delta_name=None, dataset_name=None):
+    database = db_utilities.get_database_name()
+    workers = db_utilities.get_load_workers()
+
+    try:
+        dataset = data_generation.Dataset(dataset_name)
+    except FileNotFoundError:
+        io_controller.out_info('Delta loading aborted.')
+        return False
+
+    delta = dataset.get_delta(delta_name)
+
+    if delta is None:
+        io_controller.out_error('No delta to load was found for dataset:', dataset.dataset_name)
+        io_controller.out_info('Delta loading aborted.')
+        return False
+
+    with ExitStack() as stack:
+        sessions = list(stack.enter_context(client.session(database=database, session_type=SessionType.DATA)) for _ in range(workers))
+        data_loaders.load_delta(sessions, dataset, delta)
+        io_controller.out_info('Delta loaded for database:', database)
+        return True
+
+
+def rebuild_database(client, dataset_name=None, force=False):
+    created = create_database(client, force=force)
 
     if not created:
         return False
 
-    define_schema(client)
-    load_data(client)
+    define_schema(client, force=force)
+    load_data(client, dataset_name=dataset_name, force=force)
     return True
 
 
 def provide_graph_statistics(client):
     database = db_utilities.get_database_name()
+    workers = db_utilities.get_statistics_workers()
+
+    if not db_controller.database_exists(client, database):
+        io_controller.out_error('Cannot provide graph statistics as no database with name', database, 'exists.')
+        return False
+
+    with ExitStack() as stack:
+        sessions = list(stack.enter_context(client.session(database=database, session_type=SessionType.DATA)) for _ in range(workers))
 
-    with client.session(database=database, session_type=SessionType.DATA) as session:
         try:
-            statistics = db_controller.get_graph_statistics(session)
+            statistics = db_controller.get_graph_statistics(sessions)
         except TypeDBClientException:
-            if not db_controller.database_exists(client, database):
-                io_controller.out_error('Cannot provide graph statistics as no database with name', database, 'exists.')
-            else:
-                io_controller.out_error('Cannot provide graph statistics as schema is undefined for database:', database)
-
+            io_controller.out_error('Cannot provide graph statistics as schema is undefined for database:', database)
             return False
         except ZeroDivisionError:
             io_controller.out_error('Cannot provide graph statistics as there is no data loaded for database:', database)
@@ -132,3 +171,19 @@ def run_test_queries(client):
 
                 for item in result:
                     io_controller.out_info(item)
+
+
+def run_test_query(session, query):
+    return len(db_controller.get(session, [query])[0])
+
+
+def benchmark_test_queries(client, params):
+    # Each concurrent query stream is given its own session, with the same inference options as the test queries.
+
+    database = db_utilities.get_database_name()
+    options = TypeDBOptions.core().set_infer(db_utilities.get_rule_inference())
+    test_queries = db_utilities.get_named_queries('test_queries')
+
+    with ExitStack() as stack:
+        sessions = list(stack.enter_context(client.session(database=database, session_type=SessionType.DATA, options=options)) for _ in range(params['concurrency']))
+        return benchmark.benchmark_queries(run_test_query, sessions, test_queries, params)
@@ -35,6 +35,50 @@ def get_rule_inference():
         return False
 
 
+def get_batch_size():
+    try:
+        batch_size = int(utilities.get_config_params('typedb_config.ini', 'data_loading')['batch_size'])
+
+        if batch_size < 1:
+            raise ValueError
+
+        io_controller.out_debug('Write batch size set to:', batch_size)
+        return batch_size
+    except (KeyError, ValueError):
+        io_controller.out_debug('Write batch size set to 1 by default as no correct option was set.')
+        io_controller.out_debug('Check configuration at:', os.getcwd() + '/typedb_config.ini')
+        return 1
+
+
+def get_batch_bytes():
+    try:
+        batch_bytes = int(utilities.get_config_params('typedb_config.ini', 'data_loading')['batch_bytes'])
+
+        if batch_bytes < 1:
+            raise ValueError
+
+        io_controller.out_debug('Write batch size limit set to:', batch_bytes, 'bytes')
+        return batch_bytes
+    except (KeyError, ValueError):
+        io_controller.out_debug('No write batch size limit set.')
+        return None
+
+
+def get_load_workers():
+    try:
+        workers = int(utilities.get_config_params('typedb_config.ini', 'data_loading')['workers'])
+
+        if workers < 1:
+            raise ValueError
+
+        io_controller.out_debug('Data loading workers set to:', workers)
+        return workers
+    except (KeyError, ValueError):
+        io_controller.out_debug('Data loading workers set to 1 by default as no correct option was set.')
+        io_controller.out_debug('Check configuration at:', os.getcwd() + '/typedb_config.ini')
+        return 1
+
+
 def get_saved_query(query_name, query_section):
     try:
         file_name = utilities.get_config_params('typedb_config.ini', query_section)[query_name]
@@ -59,3 +103,22 @@ def get_saved_query(query_name, query_section):
 
 def get_saved_queries(query_section):
     return list(get_saved_query(query_name, query_section) for query_name in utilities.get_config_params('typedb_config.ini', query_section))
+
+
+def get_named_queries(query_section):
+    return {query_name: get_saved_query(query_name, query_section) for query_name in utilities.get_config_params('typedb_config.ini', query_section)}
+
+
+def get_statistics_workers():
+    try:
+        workers = int(utilities.get_config_params('typedb_config.ini', 'graph_statistics')['workers'])
+
+        if workers < 1:
+            raise ValueError
+
+        io_controller.out_debug('Graph statistics workers set to:', workers)
+        return workers
+    except (KeyError, ValueError):
+        io_controller.out_debug('Graph statistics workers set to 1 by default as no correct option was set.')
+        io_controller.out_debug('Check configuration at:', os.getcwd() + '/typedb_config.ini')
+        return 1
@@ -9,5 +9,5 @@ with db_controller.client() as client:
     data_operations.generate_new_dataset()
     db_operations.ensure_server_connection(client)
     db_operations.rebuild_database(client)
-    # db_operations.provide_graph_statistics(client)
+    db_operations.provide_graph_statistics(client)
     db_operations.run_test_queries(client)